@@ -0,0 +1,169 @@
+"""Per-command latency and Firestore op counts against the in-memory Firestore fake.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_commands --iterations 50 --latency 0.02
+
+Each handler is called directly with fake interactions, so the numbers reflect
+the data access pattern of the command (round trips x latency), not Discord.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from types import SimpleNamespace
+
+from benchmarks.fake_discord import FakeGuild, FakeInteraction
+from benchmarks.fake_firestore import FakeFirestore
+from cogs.projects import ProjectsCog, PROJECT_CATEGORY_ID, ANNOUNCEMENT_CHANNEL_ID
+from cogs.search import SearchCog
+from cogs.taskboard import TaskboardCog
+from cogs.user import UsersCog
+from utils.firestore import FirestoreRepository
+from utils.permissions import PermissionService
+from utils.deadlines import DeadlineScheduler
+from utils.dispatcher import MessageDispatcher
+from utils.members import MemberDirectory
+from utils.search import SearchIndex, load_task_indexes
+from utils.autocomplete import AutocompleteIndex
+from utils.project_index import ProjectIndex
+
+PROJECT_ID = "BENCH001"
+
+
+class Environment:
+    """A guild with one project, its members and their tasks, backed by a FakeFirestore."""
+
+    def __init__(self, members: int, tasks_per_member: int, latency: float, jitter: float):
+        self.client = FakeFirestore(latency=latency, jitter=jitter, seed=1)
+        self.guild = FakeGuild()
+        self.guild.add_channel("projects", PROJECT_CATEGORY_ID)
+        self.guild.add_channel("announcements", ANNOUNCEMENT_CHANNEL_ID)
+        core_team = self.guild.add_role("Core Team")
+        self.guild.add_role("Management")
+        self.project_role = self.guild.add_role("bench-project")
+        self.project_channel = self.guild.add_channel("bench-project")
+        self.leader = self.guild.add_member("leader", roles=[core_team, self.project_role])
+        self.members = [self.guild.add_member(f"member{i}", roles=[self.project_role]) for i in range(members)]
+
+        self.client.seed(f"projects/{PROJECT_ID}", {
+            "name": "Bench Project",
+            "description": "Benchmark fixture",
+            "leader": self.leader.mention,
+            "channel_id": str(self.project_channel.id),
+            "role_id": str(self.project_role.id),
+            "created_at": "2024-01-01T00:00:00",
+        })
+        for member in [self.leader] + self.members:
+            self.client.seed(f"users/{member.id}", {
+                "discord_tag": member.name,
+                "display_name": member.name,
+                "bio": "Benchmark member",
+                "github": f"https://github.com/{member.name}",
+                "joined_at": member.joined_at.isoformat(),
+            })
+            for n in range(tasks_per_member):
+                task_id = f"{PROJECT_ID}-{member.id}-{n}"
+                self.client.seed(f"users/{member.id}/tasks/{task_id}", {
+                    "task_name": f"Task {n}",
+                    "task_description": "Benchmark task",
+                    "deadline": "2030-01-01 00:00:00",
+                    "task_status": "On going",
+                    "task_id": task_id,
+                    "project_id": PROJECT_ID,
+                    "assigned_by": self.leader.name,
+                    "assigned_to": member.name,
+                    "created_at": f"2024-01-01T00:00:{n:02d}",
+                })
+
+        repository = FirestoreRepository(client=self.client)
+        firebase = SimpleNamespace(client=self.client, repository=repository)
+        self.bot = SimpleNamespace(firebase=firebase, project_index=ProjectIndex(firebase),
+                                   permissions=PermissionService(), deadlines=DeadlineScheduler(),
+                                   members=MemberDirectory(), search=SearchIndex(), autocomplete=AutocompleteIndex())
+
+    async def start(self):
+        # No rate window in the benchmark: it measures data access, not Discord pacing
+        self.bot.dispatcher = MessageDispatcher(rate=1_000_000, window=0.001)
+        await self.bot.project_index.start()
+        await load_task_indexes(self.bot.firebase.repository, self.bot.project_index,
+                                self.bot.search, self.bot.autocomplete)
+        self.projects = ProjectsCog(self.bot)
+        self.taskboard = TaskboardCog(self.bot)
+        self.users = UsersCog(self.bot)
+        self.searcher = SearchCog(self.bot)
+
+    def interaction(self, channel=None):
+        return FakeInteraction(self.leader, self.guild, channel or self.project_channel)
+
+
+def command_cases(env: Environment):
+    """Map of command name -> coroutine factory invoking its handler once."""
+    member = env.members[0]
+    return {
+        "give_task": lambda: env.taskboard.give_task.callback(
+            env.taskboard, env.interaction(), "Bench task", "Benchmark task", 7, member),
+        "give_task_bulk": lambda: env.taskboard.give_task_bulk.callback(
+            env.taskboard, env.interaction(), "Bench task", "Benchmark task", 7, None, env.project_role),
+        "task_info": lambda: env.taskboard.task_info.callback(
+            env.taskboard, env.interaction(), f"{PROJECT_ID}-{member.id}-0"),
+        "tasklist": lambda: env.taskboard.tasklist.callback(
+            env.taskboard, env.interaction(), member),
+        "project_tasklist": lambda: env.taskboard.project_tasklist.callback(
+            env.taskboard, env.interaction(), env.project_role),
+        "project_status": lambda: env.taskboard.project_status.callback(
+            env.taskboard, env.interaction(), None),
+        "search": lambda: env.searcher.search.callback(
+            env.searcher, env.interaction(), "benchmark task", None),
+        "autocomplete_task": lambda: env.taskboard.task_autocomplete(env.interaction(), "bench"),
+        "userinfo": lambda: env.users.userinfo.callback(
+            env.users, env.interaction(), member),
+        "createproject": lambda: env.projects.create_project.callback(
+            env.projects, env.interaction(), "bench-new", "New benchmark project", "https://github.com/ndg/bench"),
+    }
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(args):
+    env = Environment(args.members, args.tasks, args.latency, args.jitter)
+    await env.start()
+
+    print(f"{args.members} members x {args.tasks} tasks, {args.latency * 1000:.0f}ms latency, "
+          f"{args.iterations} iterations per command\n")
+    print(f"{'command':<18} {'p50':>9} {'p99':>9} {'reads/call':>11} {'writes/call':>12}")
+    for name, invoke in command_cases(env).items():
+        if args.command and name not in args.command:
+            continue
+        env.client.reset_ops()
+        samples = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            # Handlers print progress; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                await invoke()
+            samples.append(time.perf_counter() - started)
+        reads = env.client.ops["read"] / args.iterations
+        writes = env.client.ops["write"] / args.iterations
+        print(f"{name:<18} {percentile(samples, 0.5) * 1000:>7.1f}ms {percentile(samples, 0.99) * 1000:>7.1f}ms "
+              f"{reads:>11.1f} {writes:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated round trip in seconds")
+    parser.add_argument("--jitter", type=float, default=0.005, help="extra random latency in seconds")
+    parser.add_argument("--members", type=int, default=25)
+    parser.add_argument("--tasks", type=int, default=4, help="tasks per member")
+    parser.add_argument("--command", action="append", help="only run these commands (repeatable)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
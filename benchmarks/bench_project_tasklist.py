@@ -0,0 +1,56 @@
+"""Compare the old per-member task queries of /project_tasklist with the single collection-group query.
+
+Run from the repository root:  python -m benchmarks.bench_project_tasklist
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from benchmarks.fake_firestore import FakeFirestore
+from cogs.taskboard import TaskboardCog
+from utils.firestore import FirestoreRepository
+
+LATENCY = 0.03  # simulated Firestore round trip, seconds
+TASKS_PER_MEMBER = 3
+MEMBER_COUNTS = [5, 20, 50, 100]
+PROJECT_ID = "BENCH001"
+
+
+def build_repository(member_count):
+    client = FakeFirestore(latency=LATENCY)
+    members = [SimpleNamespace(id=1000 + i) for i in range(member_count)]
+    for member in members:
+        for n in range(TASKS_PER_MEMBER):
+            client.seed(f"users/{member.id}/tasks/{PROJECT_ID}-{member.id}-{n}",
+                        {"task_name": f"task {n}", "project_id": PROJECT_ID})
+    return members, client, FirestoreRepository(client=client)
+
+
+async def per_member_queries(db, members):
+    """The original loop: one sequential query per member."""
+    tasks = []
+    for member in members:
+        query = db.collection("users").document(str(member.id)).collection("tasks").where("project_id", "==", PROJECT_ID)
+        tasks.extend(await db.get(query))
+    return tasks
+
+
+async def main():
+    print(f"{'members':>8} {'per-member':>12} {'docs':>6} {'grouped':>10} {'docs':>6}")
+    for member_count in MEMBER_COUNTS:
+        members, client, db = build_repository(member_count)
+        started = time.perf_counter()
+        await per_member_queries(db, members)
+        baseline, baseline_reads = time.perf_counter() - started, client.ops["read"]
+
+        client.reset_ops()
+        cog = TaskboardCog(SimpleNamespace(firebase=SimpleNamespace(repository=db)))
+        started = time.perf_counter()
+        await cog.get_project_tasks(PROJECT_ID, SimpleNamespace(members=members))
+        grouped, grouped_reads = time.perf_counter() - started, client.ops["read"]
+
+        print(f"{member_count:>8} {baseline * 1000:>10.1f}ms {baseline_reads:>6} {grouped * 1000:>8.1f}ms {grouped_reads:>6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,201 @@
+"""Minimal stand-ins for the discord.py objects the command handlers touch."""
+import itertools
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import discord
+
+_ids = itertools.count(900_000_000_000_000_000)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+class FakeRole:
+    def __init__(self, name: str, role_id: int = None, guild=None):
+        self.id = role_id or next_id()
+        self.name = name
+        self.guild = guild
+        self.members = []
+        self.mention = f"<@&{self.id}>"
+
+    async def delete(self, **kwargs):
+        if self.guild and self in self.guild.roles:
+            self.guild.roles.remove(self)
+        for member in self.members:
+            member.roles.remove(self)
+        self.members = []
+
+    def __str__(self):
+        return self.name
+
+
+class FakeMember:
+    def __init__(self, name: str, member_id: int = None, roles=None, bot: bool = False, guild=None):
+        self.id = member_id or next_id()
+        self.name = name
+        self.guild = guild
+        self.display_name = name
+        self.mention = f"<@{self.id}>"
+        self.bot = bot
+        self.roles = []
+        self.display_avatar = SimpleNamespace(url=f"https://cdn.example/avatars/{self.id}.png")
+        self.joined_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for role in roles or []:
+            self._grant(role)
+
+    def _grant(self, role):
+        if role not in self.roles:
+            self.roles.append(role)
+            role.members.append(self)
+
+    def get_role(self, role_id: int):
+        return discord.utils.get(self.roles, id=role_id)
+
+    async def add_roles(self, *roles, **kwargs):
+        for role in roles:
+            self._grant(role)
+
+    async def send(self, *args, **kwargs):
+        return FakeMessage()
+
+    def __str__(self):
+        return self.name
+
+
+class FakeMessage:
+    def __init__(self, content=None, embed=None, embeds=None):
+        self.id = next_id()
+        self.content = content
+        self.embeds = embeds or ([embed] if embed else [])
+        self.embed = self.embeds[0] if self.embeds else None
+
+    async def edit(self, **kwargs):
+        return self
+
+    async def delete(self, **kwargs):
+        pass
+
+
+class FakeChannel:
+    def __init__(self, name: str, channel_id: int = None, guild=None):
+        self.id = channel_id or next_id()
+        self.name = name
+        self.guild = guild
+        self.mention = f"<#{self.id}>"
+        self.sent = []
+        self.overwrites = {}
+
+    async def send(self, content=None, **kwargs):
+        message = FakeMessage(content, kwargs.get("embed"), kwargs.get("embeds"))
+        self.sent.append(message)
+        return message
+
+    async def edit(self, **kwargs):
+        self.overwrites = kwargs.get("overwrites", self.overwrites)
+        return self
+
+    async def create_text_channel(self, name: str, **kwargs):
+        channel = FakeChannel(name, guild=self.guild)
+        channel.overwrites = kwargs.get("overwrites", {})
+        self.guild.channels[channel.id] = channel
+        return channel
+
+    async def delete(self, **kwargs):
+        self.guild.channels.pop(self.id, None)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int = None):
+        self.id = guild_id or next_id()
+        self.default_role = FakeRole("@everyone", self.id, guild=self)
+        self.roles = [self.default_role]
+        self.channels = {}
+        self.members = []
+        self.filesize_limit = 25 * 1024 * 1024
+        self.chunked = True
+
+    def add_channel(self, name: str, channel_id: int = None) -> FakeChannel:
+        channel = FakeChannel(name, channel_id, guild=self)
+        self.channels[channel.id] = channel
+        return channel
+
+    def add_role(self, name: str, role_id: int = None) -> FakeRole:
+        role = FakeRole(name, role_id, guild=self)
+        self.roles.append(role)
+        return role
+
+    def add_member(self, name: str, roles=None, member_id: int = None) -> FakeMember:
+        member = FakeMember(name, member_id, roles, guild=self)
+        self.members.append(member)
+        return member
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    def get_role(self, role_id: int):
+        return discord.utils.get(self.roles, id=role_id)
+
+    def get_member(self, member_id: int):
+        return discord.utils.get(self.members, id=member_id)
+
+    async def fetch_member(self, member_id: int):
+        member = self.get_member(member_id)
+        if member is None:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Member")
+        return member
+
+    async def fetch_members(self, limit=None, **kwargs):
+        for member in self.members[:limit]:
+            yield member
+
+    async def create_role(self, name: str, **kwargs):
+        return self.add_role(name)
+
+
+class FakeResponse:
+    def __init__(self):
+        self.done = False
+        self.messages = []
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def defer(self, **kwargs):
+        self.done = True
+
+    async def send_message(self, content=None, **kwargs):
+        self.done = True
+        self.messages.append((content, kwargs))
+
+    async def edit_message(self, **kwargs):
+        self.done = True
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append((content, kwargs))
+        return FakeMessage(content, kwargs.get("embed"), kwargs.get("embeds"))
+
+
+class FakeInteraction:
+    def __init__(self, user, guild, channel):
+        self.id = next_id()
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id
+        self.channel = channel
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+        self.created_at = discord.utils.utcnow() - timedelta(milliseconds=1)
+        self.extras = {}
+
+    async def original_response(self):
+        return FakeMessage()
+
+    async def edit_original_response(self, **kwargs):
+        return FakeMessage(kwargs.get("content"), kwargs.get("embed"))
@@ -0,0 +1,377 @@
+"""In-memory stand-in for the subset of the Firestore client the cogs use.
+
+Covers collections, documents, subcollections, collection groups, where/order_by/
+limit/start_after queries, get/set/update/delete, snapshot listeners and
+transactions. Every network call sleeps for the configured latency and is
+counted, so benchmarks can report both time and Firestore operations.
+"""
+import copy
+import functools
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1 import DELETE_FIELD
+from google.cloud.firestore_v1.transforms import Increment
+
+DOCUMENT_ID = "__name__"
+
+
+def _get_field(data: dict, field: str):
+    value = data
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _apply_update(data: dict, field: str, value):
+    parts = field.split(".")
+    target = data
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    if value is DELETE_FIELD:
+        target.pop(parts[-1], None)
+    elif isinstance(value, Increment):
+        target[parts[-1]] = (target.get(parts[-1]) or 0) + value.value
+    else:
+        target[parts[-1]] = copy.deepcopy(value)
+
+
+def _merge(data: dict, updates: dict):
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            _merge(data[key], value)
+        else:
+            _apply_update(data, key, value)
+
+
+def _resolve_sentinels(updates: dict) -> dict:
+    resolved = {}
+    for key, value in updates.items():
+        if isinstance(value, dict):
+            resolved[key] = _resolve_sentinels(value)
+        elif isinstance(value, Increment):
+            resolved[key] = value.value
+        elif value is not DELETE_FIELD:
+            resolved[key] = copy.deepcopy(value)
+    return resolved
+
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a is not None and a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+    "not-in": lambda a, b: a is not None and a not in b,
+    "array_contains": lambda a, b: isinstance(a, list) and b in a,
+    "array_contains_any": lambda a, b: isinstance(a, list) and any(item in a for item in b),
+}
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+    def get(self, field: str):
+        if self._data is None or _get_field(self._data, field) is None:
+            raise KeyError(field)
+        return copy.deepcopy(_get_field(self._data, field))
+
+
+class FakeDocument:
+    def __init__(self, client, path: tuple):
+        self._client = client
+        self._path = path
+        self.id = path[-1]
+
+    @property
+    def path(self) -> str:
+        return "/".join(self._path)
+
+    @property
+    def parent(self):
+        return FakeCollection(self._client, self._path[:-1])
+
+    def collection(self, name: str):
+        return FakeCollection(self._client, self._path + (name,))
+
+    def get(self, transaction=None):
+        self._client._round_trip()
+        with self._client._lock:
+            data = copy.deepcopy(self._client.documents.get(self._path))
+        self._client.ops["read"] += 1
+        return FakeSnapshot(self, data)
+
+    def set(self, data: dict, merge: bool = False):
+        self._client._round_trip()
+        self._client._write(self._path, data, merge=merge)
+
+    def update(self, data: dict):
+        self._client._round_trip()
+        self._client._write(self._path, data, update=True)
+
+    def delete(self):
+        self._client._round_trip()
+        self._client._delete(self._path)
+
+    def __eq__(self, other):
+        return isinstance(other, FakeDocument) and other._path == self._path
+
+    def __hash__(self):
+        return hash(self._path)
+
+
+class FakeQuery:
+    def __init__(self, client, parent, all_descendants=False, filters=(), orders=(), limit=None, cursor=None):
+        self._client = client
+        self._parent = parent
+        self._all_descendants = all_descendants
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit
+        self._cursor = cursor
+
+    def _copy(self, **changes):
+        fields = dict(all_descendants=self._all_descendants, filters=self._filters, orders=self._orders,
+                      limit=self._limit, cursor=self._cursor)
+        fields.update(changes)
+        return FakeQuery(self._client, self._parent, **fields)
+
+    def where(self, field_path=None, op_string=None, value=None, *, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path, direction="ASCENDING"):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count: int):
+        return self._copy(limit=count)
+
+    def start_after(self, snapshot):
+        return self._copy(cursor=snapshot)
+
+    def _matches(self, path: tuple, data: dict) -> bool:
+        if self._all_descendants:
+            if len(path) % 2 or path[-2] != self._parent.id:
+                return False
+        elif path[:-1] != self._parent._path:
+            return False
+        for field, op, value in self._filters:
+            if not _OPERATORS[op](_get_field(data, field), value):
+                return False
+        # Firestore leaves out documents that lack an order_by field
+        return all(field == DOCUMENT_ID or _get_field(data, field) is not None for field, _ in self._orders)
+
+    def _sort_key(self, path: tuple, data: dict):
+        values = [path if field == DOCUMENT_ID else _get_field(data, field) for field, _ in self._orders]
+        return values + [path]
+
+    def _compare(self, left, right) -> int:
+        directions = [direction for _, direction in self._orders] + ["ASCENDING"]
+        for a, b, direction in zip(left, right, directions):
+            if a == b:
+                continue
+            result = -1 if a < b else 1
+            return -result if direction == "DESCENDING" else result
+        return 0
+
+    def _run(self):
+        with self._client._lock:
+            rows = [(path, copy.deepcopy(data)) for path, data in self._client.documents.items()
+                    if self._matches(path, data)]
+        rows.sort(key=functools.cmp_to_key(lambda a, b: self._compare(self._sort_key(*a), self._sort_key(*b))))
+        if self._cursor is not None:
+            cursor_key = self._sort_key(self._cursor.reference._path, self._cursor._data or {})
+            rows = [row for row in rows if self._compare(self._sort_key(*row), cursor_key) > 0]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return [FakeSnapshot(FakeDocument(self._client, path), data) for path, data in rows]
+
+    def get(self, transaction=None):
+        self._client._round_trip()
+        docs = self._run()
+        # An empty query is still billed as one read
+        self._client.ops["read"] += max(len(docs), 1)
+        return docs
+
+    def stream(self, transaction=None):
+        return iter(self.get(transaction=transaction))
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client, path: tuple):
+        super().__init__(client, self)
+        self._path = path
+        self.id = path[-1]
+
+    @property
+    def parent(self):
+        return FakeDocument(self._client, self._path[:-1]) if len(self._path) > 1 else None
+
+    def document(self, document_id: str = None):
+        if document_id is None:
+            document_id = "".join(self._client._rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=20))
+        return FakeDocument(self._client, self._path + (str(document_id),))
+
+    def on_snapshot(self, callback):
+        return self._client._watch(self, callback)
+
+
+class FakeTransaction:
+    """Buffers writes until commit; transactions are serialized by a client-wide lock."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, client):
+        self._client = client
+        self._id = None
+        self._read_only = False
+        self._max_attempts = 5
+        self._writes = []
+
+    def _clean_up(self):
+        self._writes = []
+        self._id = None
+
+    def _begin(self, retry_id=None):
+        self._client._transaction_lock.acquire()
+        self._id = next(self._ids)
+
+    def _commit(self):
+        try:
+            self._client._round_trip()
+            for action, path, data, options in self._writes:
+                if action == "delete":
+                    self._client._delete(path)
+                else:
+                    self._client._write(path, data, **options)
+        finally:
+            self._clean_up()
+            self._client._transaction_lock.release()
+
+    def _rollback(self):
+        if self._id is not None:
+            self._clean_up()
+            self._client._transaction_lock.release()
+
+    def get_all(self, references):
+        self._client._round_trip()
+        with self._client._lock:
+            snapshots = [FakeSnapshot(reference, copy.deepcopy(self._client.documents.get(reference._path)))
+                         for reference in references]
+        self._client.ops["read"] += len(snapshots)
+        return iter(snapshots)
+
+    def get(self, query):
+        return iter(query.get(transaction=self))
+
+    def set(self, reference, data: dict, merge: bool = False):
+        self._writes.append(("set", reference._path, data, {"merge": merge}))
+
+    def update(self, reference, data: dict):
+        self._writes.append(("update", reference._path, data, {"update": True}))
+
+    def delete(self, reference):
+        self._writes.append(("delete", reference._path, None, {}))
+
+
+class FakeFirestore:
+    """Fake Firestore client. `latency` (+ up to `jitter`) seconds are slept per round trip."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.documents = {}
+        self.ops = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._transaction_lock = threading.Lock()
+        self._watches = []
+
+    def collection(self, name: str):
+        return FakeCollection(self, (name,))
+
+    def collection_group(self, name: str):
+        return FakeQuery(self, FakeCollection(self, (name,)), all_descendants=True)
+
+    def document(self, path: str):
+        return FakeDocument(self, tuple(path.split("/")))
+
+    def transaction(self, **kwargs):
+        return FakeTransaction(self)
+
+    def seed(self, path: str, data: dict):
+        """Store a document directly, without latency or op counting."""
+        with self._lock:
+            self.documents[tuple(path.split("/"))] = _resolve_sentinels(data)
+
+    def reset_ops(self):
+        self.ops.clear()
+
+    def _round_trip(self):
+        delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+    def _write(self, path: tuple, data: dict, merge: bool = False, update: bool = False):
+        with self._lock:
+            current = self.documents.get(path)
+            if update:
+                if current is None:
+                    raise NotFound(f"No document to update: {'/'.join(path)}")
+                current = copy.deepcopy(current)
+                for key, value in data.items():
+                    _apply_update(current, key, value)
+            elif merge and current is not None:
+                current = copy.deepcopy(current)
+                _merge(current, data)
+            else:
+                current = _resolve_sentinels(data)
+            change_type = "MODIFIED" if path in self.documents else "ADDED"
+            self.documents[path] = current
+            self.ops["write"] += 1
+        self._notify(path, change_type, current)
+
+    def _delete(self, path: tuple):
+        with self._lock:
+            existed = self.documents.pop(path, None) is not None
+            self.ops["write"] += 1
+        if existed:
+            self._notify(path, "REMOVED", None)
+
+    def _watch(self, collection, callback):
+        watch = SimpleNamespace(path=collection._path, callback=callback)
+        watch.unsubscribe = lambda: self._watches.remove(watch) if watch in self._watches else None
+        self._watches.append(watch)
+        docs = collection._run()
+        self.ops["read"] += len(docs)
+        changes = [SimpleNamespace(type=SimpleNamespace(name="ADDED"), document=doc) for doc in docs]
+        callback(docs, changes, datetime.now(timezone.utc))
+        return watch
+
+    def _notify(self, path: tuple, change_type: str, data):
+        for watch in list(self._watches):
+            if path[:-1] == watch.path:
+                document = FakeSnapshot(FakeDocument(self, path), copy.deepcopy(data))
+                change = SimpleNamespace(type=SimpleNamespace(name=change_type), document=document)
+                watch.callback([document], [change], datetime.now(timezone.utc))
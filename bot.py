@@ -1,13 +1,33 @@
+from utils.startup import PROCESS_START, StartupTimer
+import time
 import discord
 from discord.ext import commands
 import os
 import asyncio
-from flask import Flask
-import threading
 from dotenv import load_dotenv
+from utils.firebase import FirebaseProvider
+from utils.project_index import ProjectIndex
+from utils.command_sync import sync_commands
+from utils.metrics import start_metrics_server
+from utils.permissions import PermissionService, MissingPrivilegedRole
+from utils.deadlines import DeadlineScheduler
+from utils.dispatcher import MessageDispatcher
+from utils.members import MemberDirectory, member_cache_options
+from utils.search import SearchIndex, load_task_indexes
+from utils.autocomplete import AutocompleteIndex
 
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
+METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "8080"))
+COMMAND_PREFIX = "!"
+# Prefix commands answered with a fixed reply, without going through the command parser
+STATIC_REPLIES = {
+    "hello": "Hello!",
+}
+
+startup = StartupTimer()
+startup.mark("imports", PROCESS_START)
 
 # Define intents
 intents = discord.Intents.default()
@@ -16,39 +36,110 @@ intents.presences = False
 intents.messages = True
 intents.members = True
 
-# Create bot instance
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Create bot instance; MEMBER_CACHE picks how many guild members stay resident
+bot = commands.Bot(command_prefix=COMMAND_PREFIX, intents=intents, **member_cache_options(intents))
+
+# Shared Firebase app/client, injected into the cogs through the bot
+bot.firebase = FirebaseProvider()
+bot.project_index = ProjectIndex(bot.firebase)
+bot.permissions = PermissionService()
+bot.permissions.register(bot)
+bot.deadlines = DeadlineScheduler()
+# Members outside the gateway cache are fetched on demand into a bounded LRU
+bot.members = MemberDirectory()
+bot.members.register(bot)
+bot.search = SearchIndex()
+bot.autocomplete = AutocompleteIndex()
+# Outbound messages go through one rate-aware queue; created in main() once the loop is running
+bot.dispatcher = None
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+    if isinstance(error, MissingPrivilegedRole):
+        if interaction.response.is_done():
+            await interaction.followup.send(str(error), ephemeral=True)
+        else:
+            await interaction.response.send_message(str(error), ephemeral=True)
+        return
+    print(f"Error in /{interaction.command.name if interaction.command else '?'}: {error}")
 
 @bot.event
 async def on_ready():
     print(f'Logged in as {bot.user.name} - {bot.user.id}')
+    if "gateway" not in startup.phases:
+        startup.mark("gateway", bot.connect_started)
+        startup.report()
     try:
         # Set bot activity
         activity = discord.Activity(type=discord.ActivityType.listening, name="Nexions")
         await bot.change_presence(activity=activity)
         print("Bot status set to 'Listening to Nexions'")
 
-        # Sync slash commands
-        await bot.tree.sync()
-        print("Slash commands synced globally!")
+        # Sync slash commands once per process, and only if the command tree changed
+        if not getattr(bot, "commands_synced", False):
+            await sync_commands(bot)
+            bot.commands_synced = True
     except Exception as e:
         print(f"Failed to sync commands or set status: {e}")
 
+# The only message handler: replaces the default one so each command is processed exactly once
+@bot.event
+async def on_message(message):
+    # Most messages are chat or other bots; drop them before any parsing
+    if message.author.bot or not message.content.startswith(COMMAND_PREFIX):
+        return
+    name = message.content[len(COMMAND_PREFIX):].split(None, 1)
+    reply = STATIC_REPLIES.get(name[0]) if name else None
+    if reply is not None:
+        await message.channel.send(reply)
+        return
+    await bot.process_commands(message)
+
 # Load cogs
+async def load_cog(name):
+    try:
+        await bot.load_extension(f'cogs.{name}')
+        print(f'Loaded Cog: {name}')
+    except Exception as e:
+        print(f'Failed to load Cog {name}: {e}')
+
 async def load_cogs():
-    for filename in os.listdir('./cogs'):
-        if filename.endswith('.py') and filename not in ['__init__.py', 'firebase.py']:
-            try:
-                await bot.load_extension(f'cogs.{filename[:-3]}')
-                print(f'Loaded Cog: {filename[:-3]}')
-            except Exception as e:
-                print(f'Failed to load Cog {filename[:-3]}: {e}')
+    # Extension imports are synchronous, so cogs load one after the other
+    for filename in sorted(os.listdir('./cogs')):
+        if filename.endswith('.py') and filename != '__init__.py':
+            await load_cog(filename[:-3])
+
+# Firebase setup runs in a worker thread while cogs load and the gateway connects; it is the
+# only startup work that overlaps. Cogs import nothing from google, so the two never race.
+# Commands that arrive before the project index is ready fall back to queries.
+async def init_firebase():
+    try:
+        with startup.phase("firebase"):
+            await bot.firebase.warm_up()
+        with startup.phase("project_index"):
+            await bot.project_index.start()
+        startup.report("Firebase ready")
+    except Exception as e:
+        print(f"Failed to load project index, falling back to queries: {e}")
+    try:
+        with startup.phase("task_indexes"):
+            await load_task_indexes(bot.firebase.repository, bot.project_index, bot.search, bot.autocomplete)
+    except Exception as e:
+        print(f"Failed to build the search and autocomplete indexes: {e}")
 
 # Main entry point
 async def main():
     async with bot:
-        await load_cogs()
-        await bot.start(TOKEN)
+        bot.dispatcher = MessageDispatcher()
+        start_metrics_server(METRICS_HOST, METRICS_PORT)
+        firebase_task = asyncio.create_task(init_firebase())
+        with startup.phase("cogs"):
+            await load_cogs()
+        with startup.phase("login"):
+            await bot.login(TOKEN)
+        bot.connect_started = time.perf_counter()
+        await bot.connect()
+        firebase_task.cancel()
 
 # Run the bot
 asyncio.run(main())
@@ -1,5 +1,7 @@
 import discord
 from discord.ext import commands
+from utils.purge import purge_messages
+from utils.command_sync import sync_commands
 
 class UtilityCommands(commands.Cog):
     def __init__(self, bot):
@@ -9,16 +11,6 @@ class UtilityCommands(commands.Cog):
     async def on_ready(self):
         print(f'Logged in as {self.bot.user}')
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author == self.bot.user:
-            return
-
-        if message.content.startswith('!hello'):
-            await message.channel.send('Hello!')
-
-        await self.bot.process_commands(message)
-
     @commands.command()
     async def purge(self, ctx, amount):
         if amount.isdigit():
@@ -27,49 +19,43 @@ class UtilityCommands(commands.Cog):
                 await ctx.send("Amount must be greater than 0")
                 return
 
-            deleted = await ctx.channel.purge(limit=amount + 1)
-            await ctx.send(f"{len(deleted) - 1} Message(s) purged.", delete_after=30)
+            result = await purge_messages(ctx.channel, limit=amount, before=ctx.message)
+            await ctx.message.delete()
+            await ctx.send(f"{result.deleted} Message(s) purged. ({result.summary()})", delete_after=30)
         else:
             await ctx.send("Please enter a valid number.", delete_after=1.5)
             await ctx.message.delete()
 
     @commands.command()
     async def clsuser(self, ctx, user: discord.Member):
-        delete = 0
-        async for message in ctx.channel.history(limit=500):
-            if delete >= 100:
-                break
-            if message.author == user:
-                await message.delete()
-                delete += 1
+        result = await purge_messages(ctx.channel, limit=100, scan=500, before=ctx.message,
+                                      check=lambda message: message.author == user)
 
-        await ctx.send(f"Purged {delete} messages from {user.display_name}.", delete_after=30)
+        await ctx.send(f"Purged {result.deleted} messages from {user.display_name}. ({result.summary()})", delete_after=30)
         await ctx.message.delete()
 
     @commands.command()
     async def clsbots(self, ctx):
-        delete = 0
-        async for message in ctx.channel.history(limit=500):
-            if delete >= 100:
-                break
-            if message.author.bot:
-                await message.delete()
-                delete += 1
+        result = await purge_messages(ctx.channel, limit=100, scan=500, before=ctx.message,
+                                      check=lambda message: message.author.bot)
 
-        await ctx.send(f"Purged {delete} bot message(s).", delete_after=30)
+        await ctx.send(f"Purged {result.deleted} bot message(s). ({result.summary()})", delete_after=30)
         await ctx.message.delete()
 
     @discord.app_commands.command(name="cls", description="Clear Msg's")
-    async def cls(self, ctx):
-        delete = 0
-        async for message in ctx.channel.history(limit=400):
-            if delete >= 100:
-                break
-            if not message.author.bot:
-                await message.delete()
-                delete += 1
+    async def cls(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        result = await purge_messages(interaction.channel, limit=100, scan=400,
+                                      check=lambda message: not message.author.bot)
+
+        await interaction.followup.send(f"Purged {result.deleted} user message(s). ({result.summary()})", ephemeral=True)
 
-        await ctx.send(f"Purged {delete} user message(s).", delete_after=30)
+    @commands.command(name="sync")
+    @commands.is_owner()
+    async def sync(self, ctx):
+        """Force a slash command sync even if the command tree hash is unchanged."""
+        await sync_commands(self.bot, force=True)
+        await ctx.send("Slash commands synced.", delete_after=30)
 
     # Slash command: Ping
     @discord.app_commands.command(name="ping", description="Responds with the bot's latency!")
@@ -0,0 +1,77 @@
+import asyncio
+import time
+import discord
+from discord.ext import commands
+from utils.metrics import metrics, resident_memory_bytes
+from utils.members import MEMBER_CACHE_PROFILE
+from utils.permissions import CORE_TEAM, require_roles_command
+
+# How often the event-loop lag and cache gauges are sampled, in seconds
+SAMPLE_INTERVAL = 5.0
+
+
+class MetricsCog(commands.Cog):
+    """Feeds command latencies and bot gauges into the shared metrics registry."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.sampler = None
+
+    async def cog_load(self):
+        self.sampler = asyncio.create_task(self.sample_loop())
+
+    async def cog_unload(self):
+        if self.sampler:
+            self.sampler.cancel()
+
+    async def sample_loop(self):
+        """Measure how late the loop wakes us up, and sample gateway latency and cache sizes."""
+        while True:
+            expected = time.perf_counter() + SAMPLE_INTERVAL
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            metrics.set_gauge("event_loop_lag_seconds", max(0.0, time.perf_counter() - expected))
+            metrics.set_gauge("bot_ready", int(self.bot.is_ready()))
+            metrics.set_gauge("gateway_latency_seconds", self.bot.latency)
+            metrics.set_gauge("guild_cache_size", len(self.bot.guilds))
+            metrics.set_gauge("member_cache_size", sum(len(guild.members) for guild in self.bot.guilds))
+            metrics.set_gauge("user_cache_size", len(self.bot.users))
+            metrics.set_gauge("member_lru_size", len(self.bot.members.cache))
+            metrics.set_gauge("process_resident_bytes", resident_memory_bytes())
+
+    def cache_report(self) -> list:
+        """One line per in-process cache: what it holds and how big it is."""
+        lines = [
+            f"**Resident memory**: {resident_memory_bytes() / 1_048_576:.1f} MiB",
+            f"**Member cache** ({MEMBER_CACHE_PROFILE}): {sum(len(guild.members) for guild in self.bot.guilds)} member(s)",
+            f"**User cache**: {len(self.bot.users)} user(s)",
+            "**Member LRU**: " + ", ".join(f"{key}: {value}" for key, value in self.bot.members.stats().items()),
+            f"**Project index**: {len(self.bot.project_index.projects)} project(s)",
+            f"**Deadline scheduler**: {len(self.bot.deadlines)} pending reminder(s)",
+            "**Search index**: " + ", ".join(f"{key}: {value}" for key, value in self.bot.search.stats().items()),
+            "**Autocomplete**: " + ", ".join(f"{key}: {value}" for key, value in self.bot.autocomplete.stats().items()),
+        ]
+        users = self.bot.get_cog("UsersCog")
+        if users:
+            lines.append(f"**Profiles**: {len(users.profiles)}/{users.profiles.maxsize}, "
+                         f"embeds: {len(users.profile_embeds)}/{users.profile_embeds.maxsize}")
+        return lines
+
+    @commands.command(name="memstats")
+    @require_roles_command(CORE_TEAM)
+    async def mem_stats(self, ctx):
+        """Report resident memory and the size of each cache."""
+        await ctx.send("\n".join(self.cache_report()), delete_after=60)
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        metrics.observe_command(f"/{command.qualified_name}", elapsed)
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx: commands.Context):
+        elapsed = (discord.utils.utcnow() - ctx.message.created_at).total_seconds()
+        metrics.observe_command(f"!{ctx.command.qualified_name}", elapsed)
+
+
+async def setup(bot):
+    await bot.add_cog(MetricsCog(bot))
@@ -2,50 +2,59 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from datetime import datetime
+import asyncio
+import functools
 import random
 import string
-from firebase_admin import credentials, firestore, initialize_app, get_app
-import os
-from dotenv import load_dotenv  # Import load_dotenv to load .env variables
-
-# Load environment variables from .env file
-load_dotenv()
-# Retrieve Firebase credentials from Replit secrets
-firebase_creds = os.getenv('FIREBASE_CREDENTIALS')
-
-# Firebase initialization
-try:
-    app = get_app("projects_app")  # Check if the app already exists
-except ValueError:
-    # Save the credentials to a temporary file
-    with open('firebase_creds.json', 'w') as f:
-        f.write(firebase_creds)
-
-    # Initialize the app with the credentials
-    cred = credentials.Certificate('firebase_creds.json')
-    app = initialize_app(cred, name="projects_app")
-
-    # Optionally remove the temporary file after initializing
-    os.remove('firebase_creds.json')
-
-# Access Firestore with the app
-db = firestore.client(app)
+from utils.permissions import CORE_TEAM, require_roles, require_roles_command
+
+PROJECT_CATEGORY_ID = 1318943943391580161
+ANNOUNCEMENT_CHANNEL_ID = 1318945614804942878
+ROLLBACK_REASON = "Project creation failed"
+
+
+def project_channel_overwrites(guild: discord.Guild, project_role: discord.Role) -> dict:
+    """Project channels are visible to the project role only."""
+    return {
+        project_role: discord.PermissionOverwrite(
+            view_channel=True,
+            send_messages=True,
+            send_messages_in_threads=True,
+            create_public_threads=True,
+            create_private_threads=True,
+            attach_files=True,
+            add_reactions=True,
+            use_external_emojis=True,
+            use_external_stickers=True,
+            read_message_history=True
+        ),
+        guild.default_role: discord.PermissionOverwrite(
+            view_channel=False  # Deny view_channel for @everyone
+        )
+    }
+
+
+def project_embed(project_id: str, project_data: dict, project_leader=None, project_image=None) -> discord.Embed:
+    """The announcement posted when a project is created."""
+    embed = discord.Embed(title=project_data["name"], description=project_data["description"], color=discord.Color.green())
+    embed.add_field(name="Project ID", value=project_id, inline=False)
+    embed.add_field(name="GitHub Link", value=project_data["github_link"], inline=False)
+    if project_data.get("prototype_link"):
+        embed.add_field(name="Prototype Link", value=project_data["prototype_link"], inline=False)
+    embed.add_field(name="Leader", value=project_leader.mention if project_leader else "Not specified", inline=False)
+    if project_image:
+        embed.set_image(url=project_image.url)
+    return embed
 
 
 class ProjectsCog(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-
-    async def check_core_team_role(self, interaction: discord.Interaction):
-        """Check if the user has the Core Team role."""
-        core_team_role = discord.utils.get(interaction.guild.roles, name="Core Team")
-        if core_team_role not in interaction.user.roles:
-            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
-            return False
-        return True
+        self.db = bot.firebase.repository
 
     @app_commands.command(name="createproject", description="Create a new project and add it to the database.")
+    @require_roles(CORE_TEAM)
     async def create_project(self, interaction: discord.Interaction, 
                              project_name: str, 
                              project_description: str, 
@@ -53,10 +62,6 @@ class ProjectsCog(commands.Cog):
                              project_prototype_link: str = None, 
                              project_image: discord.Attachment = None, 
                              project_leader: discord.Member = None):
-        # Check Core Team role
-        if not await self.check_core_team_role(interaction):
-            return
-
         # Acknowledge the interaction and defer the response
         await interaction.response.defer(ephemeral=True)
         
@@ -74,65 +79,58 @@ class ProjectsCog(commands.Cog):
             "created_at": datetime.utcnow().isoformat()
         }
 
-        # Add to Firestore
+        guild = interaction.guild
+        category = guild.get_channel(PROJECT_CATEGORY_ID)
+        announcement_channel = guild.get_channel(ANNOUNCEMENT_CHANNEL_ID)
+        undo = []  # how to remove what was created so far if a later step fails
         try:
-            # Create the project channel
-            category = interaction.guild.get_channel(1318943943391580161)  # Project category ID
-            project_channel = await category.create_text_channel(name=f"{project_name}")
-
-            # Create the project role
-            project_role = await interaction.guild.create_role(name=project_name)
+            # The role has to exist before the channel can carry its overwrite
+            project_role = await guild.create_role(name=project_name)
+            undo.append(functools.partial(project_role.delete, reason=ROLLBACK_REASON))
+            # Create the channel private from the start, with its overwrites in the same call
+            project_channel = await category.create_text_channel(
+                name=f"{project_name}", overwrites=project_channel_overwrites(guild, project_role))
+            undo.append(functools.partial(project_channel.delete, reason=ROLLBACK_REASON))
 
             # Store the project channel and role IDs as strings
             project_data["channel_id"] = str(project_channel.id)
             project_data["role_id"] = str(project_role.id)
 
-            # Add the project data to Firestore
-            db.collection("projects").document(project_id).set(project_data)
+            project_ref = self.db.collection("projects").document(project_id)
+            embed = project_embed(project_id, project_data, project_leader, project_image)
+            steps = [self.db.set(project_ref, project_data),
+                     # Not merged with other messages: a rollback must only delete this project's announcement
+                     self.bot.dispatcher.send(announcement_channel, embed=embed, coalesce=False)]
+            if project_leader:
+                steps.append(project_leader.add_roles(project_role))
+            # The remaining steps are independent of each other
+            results = await asyncio.gather(*steps, return_exceptions=True)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                if not isinstance(results[0], Exception):
+                    undo.append(functools.partial(self.db.delete, project_ref))
+                if not isinstance(results[1], Exception):
+                    undo.append(results[1].delete)
+                raise errors[0]
         except Exception as e:
-            await interaction.followup.send(f"Failed to add project to database: {e}", ephemeral=True)
+            print(f"Failed to create project {project_name}, rolling back: {e}")
+            await self.rollback(undo)
+            await interaction.followup.send(f"Failed to create project: {e}", ephemeral=True)
             return
 
-        # Create the embed
-        embed = discord.Embed(title=project_name, description=project_description, color=discord.Color.green())
-        embed.add_field(name="Project ID", value=project_id, inline=False)
-        embed.add_field(name="GitHub Link", value=project_github_link, inline=False)
-        if project_prototype_link:
-            embed.add_field(name="Prototype Link", value=project_prototype_link, inline=False)
-        embed.add_field(name="Leader", value=project_leader.mention if project_leader else "Not specified", inline=False)
-        if project_image:
-            embed.set_image(url=project_image.url)
-
-        # Send the embed to the specific channel
-        project_announcement_channel = interaction.guild.get_channel(1318945614804942878)
-        await project_announcement_channel.send(embed=embed)
-
-        # Assign role to the leader
-        if project_leader:
-            await project_leader.add_roles(project_role)
-
-        # Set permissions for the role in the project channel
-        permissions = {
-            project_role: discord.PermissionOverwrite(
-                view_channel=True,
-                send_messages=True,
-                send_messages_in_threads=True,
-                create_public_threads=True,
-                create_private_threads=True,
-                attach_files=True,
-                add_reactions=True,
-                use_external_emojis=True,
-                use_external_stickers=True,
-                read_message_history=True
-            ),
-            interaction.guild.default_role: discord.PermissionOverwrite(
-                view_channel=False  # Deny view_channel for @everyone
-            )
-        }
-        await project_channel.edit(overwrites=permissions)
+        self.bot.project_index.put(project_id, project_data)
+        self.bot.search.add_project(project_id, project_data)
+        self.bot.autocomplete.add_project(project_id, project_data)
 
         # Final confirmation message
-        await interaction.followup.send(f"Project {project_name} created successfully!", ephemeral=True)
+        await self.bot.dispatcher.send(interaction.followup, f"Project {project_name} created successfully!", ephemeral=True)
+
+    async def rollback(self, undo):
+        """Remove the role, channel, announcement and project document of a failed /createproject."""
+        results = await asyncio.gather(*(step() for step in undo), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception) and not isinstance(result, discord.NotFound):
+                print(f"Failed to roll back part of a project: {result}")
 
     @app_commands.command(name="add_member", description="Add a member to the project role.")
     async def add_member(self, interaction: discord.Interaction, member: discord.Member):
@@ -142,14 +140,12 @@ class ProjectsCog(commands.Cog):
         project_role = discord.utils.get(interaction.guild.roles, name=project_role_name)
 
         # Retrieve the project document from the database
-        project_doc = db.collection("projects").where("channel_id", "==", str(interaction.channel.id)).get()
+        project_data = await self.bot.project_index.get_by_channel(interaction.channel.id)
 
-        if not project_doc:
+        if not project_data:
             await interaction.response.send_message("Project not found in the database.", ephemeral=True)
             return
 
-        project_data = project_doc[0].to_dict()
-
         # Retrieve the stored channel and role IDs from the database
         stored_channel_id = project_data.get("channel_id")
         stored_role_id = project_data.get("role_id")
@@ -178,5 +174,13 @@ class ProjectsCog(commands.Cog):
         except Exception as e:
             await interaction.response.send_message(f"Failed to add member to the project role: {e}", ephemeral=True)
 
+    @commands.command(name="indexstats")
+    @require_roles_command(CORE_TEAM)
+    async def index_stats(self, ctx):
+        """Dump the project index hit/miss counters."""
+        stats = self.bot.project_index.stats()
+        lines = [f"**{key}**: {value}" for key, value in stats.items()]
+        await ctx.send("\n".join(lines), delete_after=60)
+
 async def setup(bot):
     await bot.add_cog(ProjectsCog(bot))
@@ -0,0 +1,62 @@
+import asyncio
+import discord
+from discord.ext import commands
+from utils.deadlines import MISSED_REMINDER_GRACE
+
+
+class RemindersCog(commands.Cog):
+    """Reminds assignees of upcoming task deadlines from the bot's deadline scheduler."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.db = bot.firebase.repository
+        self.runner = None
+
+    async def cog_load(self):
+        self.runner = asyncio.create_task(self.start())
+
+    async def cog_unload(self):
+        if self.runner:
+            self.runner.cancel()
+        self.bot.deadlines.clear()
+
+    async def start(self):
+        await self.bot.wait_until_ready()
+        try:
+            # One query at startup; after this the scheduler is fed by give_task
+            open_tasks = await self.db.get(self.db.collection_group("tasks").where("task_status", "==", "On going"))
+            for task in open_tasks:
+                # Reminders missed while the bot was offline are still sent if only slightly late
+                self.bot.deadlines.add(task.reference.parent.parent.id, task.id, task.to_dict(),
+                                       grace=MISSED_REMINDER_GRACE)
+            print(f"Deadline scheduler loaded {len(self.bot.deadlines)} reminder(s)")
+        except Exception as e:
+            print(f"Failed to load open tasks for reminders: {e}")
+        await self.bot.deadlines.run(self.send_reminder)
+
+    async def send_reminder(self, task, offset):
+        user_id = int(task["user_id"])
+        user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+
+        hours = offset.total_seconds() / 3600
+        when = "is due now" if not hours else f"is due in {hours:g} hour(s)"
+        embed = discord.Embed(
+            title=f"Reminder: {task.get('task_name')}",
+            description=f"Your task {when}.",
+            color=discord.Color.orange()
+        )
+        embed.add_field(name="Deadline", value=task.get("deadline"), inline=False)
+        embed.add_field(name="Task ID", value=task["task_id"], inline=False)
+
+        try:
+            await self.bot.dispatcher.send(user, embed=embed)
+        except discord.Forbidden:
+            # DMs closed: ping them in the project channel instead
+            project = self.bot.project_index.get(task.get("project_id"))
+            channel = self.bot.get_channel(int(project["channel_id"])) if project else None
+            if channel:
+                await self.bot.dispatcher.send(channel, user.mention, embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(RemindersCog(bot))
@@ -0,0 +1,49 @@
+import time
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+SEARCH_RESULTS = 10
+
+
+class SearchCog(commands.Cog):
+    """Keyword search over tasks and projects, answered from the in-memory search index."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    def describe(self, result: dict) -> str:
+        if result["kind"] == "project":
+            channel = f" — <#{result['channel_id']}>" if result.get("channel_id") else ""
+            return f"📁 **{result['name']}** ({result['id']}){channel}"
+        project = self.bot.project_index.get(result.get("project_id")) or {}
+        return (f"📝 **{result['name']}** ({result['id']}) — {result.get('status')}, <@{result['user_id']}>"
+                f" in {project.get('name', result.get('project_id'))}")
+
+    @app_commands.command(name="search", description="Search tasks and projects by keyword.")
+    @app_commands.describe(query="Words to look for in names and descriptions", kind="Only search tasks or projects")
+    @app_commands.choices(kind=[app_commands.Choice(name="Tasks", value="task"),
+                                app_commands.Choice(name="Projects", value="project")])
+    async def search(self, interaction: discord.Interaction, query: str, kind: str = None):
+        if not self.bot.search.ready:
+            await interaction.response.send_message("Search is still loading, try again in a moment.", ephemeral=True)
+            return
+
+        started = time.perf_counter()
+        results = self.bot.search.search(query, kind, SEARCH_RESULTS)
+        elapsed = time.perf_counter() - started
+        if not results:
+            await interaction.response.send_message(f"Nothing found for \"{query}\".", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title=f"Search: {query}"[:256],
+            description="\n".join(self.describe(result) for _, result in results),
+            color=discord.Color.orange()
+        )
+        embed.set_footer(text=f"{len(results)} result(s) in {elapsed * 1000:.1f} ms")
+        await interaction.response.send_message(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(SearchCog(bot))
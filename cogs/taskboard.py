@@ -2,73 +2,390 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timedelta
+import asyncio
 import random
+import re
 import string
-from firebase_admin import credentials, firestore, initialize_app, get_app
-import os
-from dotenv import load_dotenv 
+from utils.permissions import CORE_TEAM, MANAGEMENT, require_roles
+from utils.export import EXPORT_FORMATS, GzipExportFile, task_rows
+from utils.autocomplete import MAX_CHOICE_LENGTH
+from utils.firestore import BATCH_LIMIT, api_exceptions
+from utils.dispatcher import MAX_CONTENT_LENGTH
 
-load_dotenv()
-firebase_creds = os.getenv('FIREBASE_CREDENTIALS')
 
-try:
-    app = get_app("task_app")  
-except ValueError:
-    with open('firebase_creds.json', 'w') as f:
-        f.write(firebase_creds)
+async def send_ephemeral(interaction: discord.Interaction, message: str):
+    """Reply privately, whether or not the interaction was already deferred."""
+    if interaction.response.is_done():
+        await interaction.followup.send(message, ephemeral=True)
+    else:
+        await interaction.response.send_message(message, ephemeral=True)
 
-    cred = credentials.Certificate('firebase_creds.json')
-    app = initialize_app(cred, name="task_app")
 
-    os.remove('firebase_creds.json')
+def add_task_to_stats(stats: dict, user_id: str, task_id: str, task_data: dict) -> dict:
+    """Return the project summary with one more task counted."""
+    stats = dict(stats)
+    status = task_data["task_status"]
+    stats["total_tasks"] = stats.get("total_tasks", 0) + 1
+    stats["status_counts"] = dict(stats.get("status_counts", {}))
+    stats["status_counts"][status] = stats["status_counts"].get(status, 0) + 1
+    stats["assignee_counts"] = dict(stats.get("assignee_counts", {}))
+    stats["assignee_counts"][user_id] = stats["assignee_counts"].get(user_id, 0) + 1
+    # Deadlines are "%Y-%m-%d %H:%M:%S" strings, so the smallest string is the earliest date
+    if status != "Done" and (not stats.get("next_deadline") or task_data["deadline"] < stats["next_deadline"]):
+        stats["next_deadline"] = task_data["deadline"]
+        stats["next_deadline_task"] = task_id
+    stats["updated_at"] = datetime.utcnow().isoformat()
+    return stats
 
-db = firestore.client(app)
 
+def change_task_status_in_stats(stats: dict, task_id: str, old_status: str, new_status: str,
+                                next_open_task: tuple = None) -> dict:
+    """Return the project summary with one task moved from `old_status` to `new_status`.
+
+    `next_open_task` is the (task_id, deadline) of the earliest other open task; it replaces
+    the next deadline when the task holding it is completed.
+    """
+    stats = dict(stats)
+    stats["status_counts"] = dict(stats.get("status_counts", {}))
+    old_count = stats["status_counts"].get(old_status, 0)
+    if old_count <= 0:
+        # The summary never counted this task: have the next /project_status recount the project
+        stats.pop("rebuilt_at", None)
+    stats["status_counts"][old_status] = max(0, old_count - 1)
+    stats["status_counts"][new_status] = stats["status_counts"].get(new_status, 0) + 1
+    if new_status == "Done" and stats.get("next_deadline_task") == task_id:
+        stats["next_deadline_task"], stats["next_deadline"] = next_open_task or (None, None)
+    stats["updated_at"] = datetime.utcnow().isoformat()
+    return stats
+
+
+def next_open_task(transaction, open_tasks_query, completed_task_id: str):
+    """(task_id, deadline) of the earliest open task other than `completed_task_id`, or None.
+
+    Reads at most two tasks: the completed one may still be the first match.
+    """
+    for snapshot in transaction.get(open_tasks_query.limit(2)):
+        if snapshot.id != completed_task_id:
+            return snapshot.id, snapshot.to_dict()["deadline"]
+    return None
+
+
+def rebuild_stats(transaction, stats_ref, tasks_query):
+    """Recount the project summary from every task of the project and return it.
+
+    Summaries only count the tasks written since they were introduced; this brings
+    older projects, and summaries that drifted, back in line once.
+    """
+    stats = {}
+    for task in transaction.get(tasks_query):
+        # Tasks live at users/{user_id}/tasks/{task_id}
+        stats = add_task_to_stats(stats, task.reference.parent.parent.id, task.id, task.to_dict())
+    stats["rebuilt_at"] = datetime.utcnow().isoformat()
+    transaction.set(stats_ref, stats)
+    return stats
+
+
+def take_task_numbers(transaction, counter_ref, counter_snapshot, project_id, count):
+    """Advance the project task counter by `count` and return the task ids that were taken."""
+    first_number = (counter_snapshot.to_dict() or {}).get("task_count", 0) + 1
+    transaction.set(counter_ref, {"task_count": first_number + count - 1}, merge=True)
+    return [f"{project_id}-{first_number + offset}" for offset in range(count)]
+
+
+def reserve_task_ids(transaction, project_ref, project_id, count):
+    """Reserve `count` task ids. Ids left unused because a later write failed are only gaps."""
+    counter_ref = project_ref.collection("meta").document("task_counter")
+    counter_snapshot = next(iter(transaction.get_all([counter_ref])))
+    return take_task_numbers(transaction, counter_ref, counter_snapshot, project_id, count)
+
+
+def task_index_entry(user_id: str, project_id: str) -> dict:
+    """task_index/{task_id} maps a task id to where the task lives: users/{user_id}/tasks/{task_id}."""
+    return {"user_id": user_id, "project_id": project_id}
+
+
+def write_tasks(transaction, stats_ref, stats_snapshot, tasks):
+    """Write (task_ref, index_ref, user_id, task_id, task_data) entries, their task_index entries
+    and the project summary that counts them, in the given transaction."""
+    stats = stats_snapshot.to_dict() or {}
+    for task_ref, index_ref, user_id, task_id, task_data in tasks:
+        transaction.set(task_ref, dict(task_data, task_id=task_id))
+        transaction.set(index_ref, task_index_entry(user_id, task_data["project_id"]))
+        stats = add_task_to_stats(stats, user_id, task_id, task_data)
+    transaction.set(stats_ref, stats)
+
+
+def add_tasks(transaction, stats_ref, tasks):
+    """Write already numbered tasks together with the project summary (projects/{id}/meta/stats)."""
+    stats_snapshot = next(iter(transaction.get_all([stats_ref])))
+    write_tasks(transaction, stats_ref, stats_snapshot, tasks)
+
+
+def create_task(transaction, project_ref, tasks_ref, index_ref, project_id, task_data):
+    """Take the next task number from the project counter and write the task, its
+    task_index entry and the project summary in the same transaction."""
+    counter_ref = project_ref.collection("meta").document("task_counter")
+    stats_ref = project_ref.collection("meta").document("stats")
+    # Both documents in one round trip
+    snapshots = {snapshot.id: snapshot for snapshot in transaction.get_all([counter_ref, stats_ref])}
+    task_id = take_task_numbers(transaction, counter_ref, snapshots["task_counter"], project_id, 1)[0]
+    user_id = tasks_ref.parent.id
+    write_tasks(transaction, stats_ref, snapshots["stats"],
+                [(tasks_ref.document(task_id), index_ref.document(task_id), user_id, task_id, task_data)])
+    return task_id
+
+
+def set_task_status(transaction, task_ref, stats_ref, new_status, open_tasks_query):
+    """Move a task to `new_status` and update the project summary with it.
+
+    `open_tasks_query` (the project's open tasks by deadline) is only read when the
+    task holding the next deadline is completed. Returns the task as it was before
+    the change, or None if it does not exist.
+    """
+    snapshots = {snapshot.reference.path: snapshot for snapshot in transaction.get_all([task_ref, stats_ref])}
+    task_snapshot = snapshots[task_ref.path]
+    if not task_snapshot.exists:
+        return None
+    task_data = task_snapshot.to_dict()
+    old_status = task_data.get("task_status")
+    if old_status != new_status:
+        stats = snapshots[stats_ref.path].to_dict() or {}
+        following = None
+        if new_status == "Done" and stats.get("next_deadline_task") == task_ref.id:
+            try:
+                following = next_open_task(transaction, open_tasks_query, task_ref.id)
+            except api_exceptions().FailedPrecondition as e:
+                # The (project_id, task_status, deadline) index is not deployed; recount on the next /project_status
+                print(f"Collection group query unavailable, cannot find the next deadline: {e}")
+                stats.pop("rebuilt_at", None)
+        # Every read happens before the first write of the transaction
+        transaction.update(task_ref, {"task_status": new_status, "updated_at": datetime.utcnow().isoformat()})
+        transaction.set(stats_ref, change_task_status_in_stats(stats, task_ref.id, old_status, new_status, following))
+    return task_data
+
+
+TASK_STATUSES = ["On going", "Done"]
+MENTION_PATTERN = re.compile(r"<@!?(\d+)>")
+TASK_PAGE_SIZE = 10
+# Tasks per /give_task_bulk transaction: two documents each plus the summary, under Firestore's 500 writes
+BULK_TASK_CHUNK = (BATCH_LIMIT - 1) // 2
+# Tasks read per Firestore page while exporting
+EXPORT_PAGE_SIZE = 500
+
+
+class TaskListView(discord.ui.View):
+    """Pages through a member's tasks with Firestore cursors, keeping the pages already fetched."""
+
+    def __init__(self, db, owner: discord.abc.User, target: discord.abc.User, status: str = None):
+        super().__init__(timeout=180)
+        self.db = db
+        self.owner = owner
+        self.target = target
+        self.status = status
+        self.pages = []  # cached pages of task snapshots
+        self.has_more = True
+        self.page = 0
+        self.message = None
+
+    def build_query(self):
+        query = self.db.collection("users").document(str(self.target.id)).collection("tasks")
+        if self.status:
+            # Needs the (task_status, created_at) index in firestore.indexes.json
+            query = query.where("task_status", "==", self.status)
+        # One extra document tells us whether another page exists
+        return query.order_by("created_at").limit(TASK_PAGE_SIZE + 1)
+
+    async def load_filtered(self):
+        """Without the status index: read the member's tasks in order and filter them here."""
+        query = self.db.collection("users").document(str(self.target.id)).collection("tasks").order_by("created_at")
+        tasks = [task for task in await self.db.get(query) if task.to_dict().get("task_status") == self.status]
+        self.pages = [tasks[start:start + TASK_PAGE_SIZE] for start in range(0, len(tasks), TASK_PAGE_SIZE)]
+        self.has_more = False
+
+    async def load_page(self, index: int) -> bool:
+        """Make sure page `index` is cached, reading only the pages not fetched yet."""
+        while len(self.pages) <= index:
+            if not self.has_more:
+                return False
+            query = self.build_query()
+            if self.pages:
+                query = query.start_after(self.pages[-1][-1])
+            try:
+                tasks = await self.db.get(query)
+            except api_exceptions().FailedPrecondition as e:
+                if not self.status:
+                    raise
+                print(f"Task status index unavailable, filtering {self.target.id}'s tasks in memory: {e}")
+                await self.load_filtered()
+                continue
+            self.has_more = len(tasks) > TASK_PAGE_SIZE
+            if not tasks:
+                return False
+            self.pages.append(tasks[:TASK_PAGE_SIZE])
+        return True
+
+    def build_embed(self) -> discord.Embed:
+        task_list = []
+        first_number = self.page * TASK_PAGE_SIZE + 1
+        for number, task in enumerate(self.pages[self.page], start=first_number):
+            task_data = task.to_dict()
+            task_list.append(f"**{number}. {task_data['task_name']}** - {task_data['task_status']}\nDeadline: {task_data['deadline']}")
+
+        embed = discord.Embed(
+            title=f"Tasks Assigned to {self.target.name}",
+            description="\n\n".join(task_list)[:4096],
+            color=discord.Color.orange()
+        )
+        footer = f"Page {self.page + 1}"
+        if self.status:
+            footer += f" • {self.status}"
+        embed.set_footer(text=footer)
+        return embed
+
+    def update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page + 1 >= len(self.pages) and not self.has_more
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.owner.id:
+            await interaction.response.send_message("Only the person who ran this command can change pages.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # Reading the next page may take longer than Discord waits for a response
+        await interaction.response.defer()
+        try:
+            if await self.load_page(self.page + 1):
+                self.page += 1
+        except Exception as e:
+            print(f"Error while fetching tasks: {e}")
+            await interaction.followup.send(f"Failed to fetch the next page: {e}", ephemeral=True)
+            return
+        self.update_buttons()
+        await interaction.edit_original_response(embed=self.build_embed(), view=self)
 
 
 class TaskboardCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.db = bot.firebase.repository
 
-    async def check_leader_or_core(self, interaction: discord.Interaction, project_data):
+    async def check_leader_or_core(self, interaction: discord.Interaction, project_data,
+                                   message: str = "You do not have permission to give tasks."):
         """Check if the user is a project leader or has a Core Team or Management role."""
-        core_team_role = discord.utils.get(interaction.guild.roles, name="Core Team")
-        management_role = discord.utils.get(interaction.guild.roles, name="Management")
-
-        if core_team_role in interaction.user.roles or management_role in interaction.user.roles:
+        if self.bot.permissions.has_any(interaction.user, CORE_TEAM, MANAGEMENT):
             return True
        
         project_leader_tag = project_data.get('leader')
         if project_leader_tag and interaction.user.mention == project_leader_tag:
             return True
         
-        await interaction.response.send_message("You do not have permission to give tasks.", ephemeral=True)
+        await send_ephemeral(interaction, message)
         return False
 
     async def get_project_data(self, interaction: discord.Interaction):
         """Get project data based on the channel where the command was invoked."""
         project_channel_id = str(interaction.channel.id)
         try:
-            project_doc = db.collection("projects").where("channel_id", "==", project_channel_id).get()
-            if not project_doc:
-                await interaction.response.send_message("This command can only be used in a project channel.", ephemeral=True)
+            project_data = await self.bot.project_index.get_by_channel(project_channel_id)
+            if not project_data:
+                await send_ephemeral(interaction, "This command can only be used in a project channel.")
                 return None
-            project_data = project_doc[0].to_dict()
-            project_id = project_doc[0].id  
-            project_data['project_id'] = project_id 
             return project_data
         except Exception as e:
             print(f"Error fetching project data: {e}")
-            await interaction.response.send_message("An error occurred while fetching project data.", ephemeral=True)
+            await send_ephemeral(interaction, "An error occurred while fetching project data.")
             return None
 
 
     async def get_project_role(self, interaction: discord.Interaction, project_data):
         """Fetch the project role from the project document."""
         project_role_id = project_data.get('role_id')
-        project_role = discord.utils.get(interaction.guild.roles, id=int(project_role_id))
+        project_role = interaction.guild.get_role(int(project_role_id))
         return project_role
 
+    def track_task(self, user_id: str, task_id: str, task_data: dict):
+        """Bring the in-memory views of a task (reminders, search, autocomplete) up to date after a write."""
+        if task_data.get("task_status") == "Done":
+            self.bot.deadlines.cancel(user_id, task_id)
+        else:
+            self.bot.deadlines.add(user_id, task_id, task_data)
+        self.bot.search.add_task(user_id, task_id, task_data)
+        self.bot.autocomplete.add_task(user_id, task_id, task_data)
+
+    async def find_task(self, task_id: str):
+        """Locate a task through task_index: one document read however many users there are.
+
+        Returns (task reference, index entry), or (None, message for the user) if it cannot be found.
+        """
+        index_ref = self.db.collection("task_index").document(task_id)
+        entry = await self.db.get(index_ref)
+        if entry.exists:
+            entry = entry.to_dict()
+        else:
+            # Tasks created before the index existed: look them up once and backfill the entry
+            query = self.db.collection_group("tasks").where("task_id", "==", task_id).limit(1)
+            try:
+                matches = await self.db.get(query)
+            except api_exceptions().FailedPrecondition as e:
+                # The collection-group index on tasks.task_id is not deployed
+                print(f"Collection group query unavailable, cannot look up task {task_id}: {e}")
+                return None, (f"No task found with ID {task_id}. Tasks created before the task index "
+                              "can't be looked up until the tasks.task_id index is deployed.")
+            if not matches:
+                return None, f"No task found with ID {task_id}."
+            entry = task_index_entry(matches[0].reference.parent.parent.id, matches[0].to_dict().get("project_id"))
+            await self.db.set(index_ref, entry)
+        task_ref = self.db.collection("users").document(entry["user_id"]).collection("tasks").document(task_id)
+        return task_ref, entry
+
+    def open_tasks_by_deadline(self, project_id: str):
+        """The project's open tasks, earliest deadline first.
+
+        Needs the (project_id, task_status, deadline) collection-group index in firestore.indexes.json.
+        """
+        return (self.db.collection_group("tasks").where("project_id", "==", project_id)
+                .where("task_status", "==", "On going").order_by("deadline"))
+
+    async def get_project_tasks(self, project_id, role):
+        """Fetch every task of a project in one query and group them by assignee id."""
+        query = self.db.collection_group("tasks").where("project_id", "==", project_id)
+        try:
+            task_docs = await self.db.get(query)
+        except api_exceptions().FailedPrecondition as e:
+            # The collection-group index on tasks.project_id is not deployed; fan out per member instead
+            print(f"Collection group query unavailable, falling back to per-member queries: {e}")
+            members = await self.bot.members.role_members(role)
+            results = await asyncio.gather(*(
+                self.db.get(self.db.collection("users").document(str(member.id)).collection("tasks").where("project_id", "==", project_id))
+                for member in members
+            ))
+            task_docs = [task for user_tasks in results for task in user_tasks]
+
+        tasks_by_user = {}
+        for task in task_docs:
+            # Tasks live at users/{user_id}/tasks/{task_id}
+            user_id = task.reference.parent.parent.id
+            tasks_by_user.setdefault(user_id, []).append(task.to_dict())
+        return tasks_by_user
+
     @app_commands.command(name="give_task", description="Assign a task to a user in the project.")
     async def give_task(self, interaction: discord.Interaction, 
                         task_name: str, 
@@ -93,14 +410,14 @@ class TaskboardCog(commands.Cog):
         project_id = project_data.get('project_id')  
     
         project_role = await self.get_project_role(interaction, project_data)
-        if project_role and project_role not in assigned_user.roles:
+        # Options resolve to a Member when the user is in the guild; otherwise look them up
+        member = assigned_user if isinstance(assigned_user, discord.Member) else \
+            await self.bot.members.get(interaction.guild, assigned_user.id)
+        if project_role and not (member and member.get_role(project_role.id)):
             print(f"{assigned_user} is not a member of the project role")  
             await interaction.followup.send(f"{assigned_user.mention} is not a member of the project role.", ephemeral=True)
             return
     
-        task_number = len(db.collection("tasks").where("project_id", "==", project_id).get()) + 1
-        task_id = f"{assigned_user.name}_{task_number}"
-
         deadline_date = (datetime.utcnow() + timedelta(days=deadline_days)).strftime("%Y-%m-%d %H:%M:%S")
     
         task_data = {
@@ -108,7 +425,6 @@ class TaskboardCog(commands.Cog):
             "task_description": task_description,
             "deadline": deadline_date,
             "task_status": "On going",
-            "task_id": task_id,
             "project_id": project_id,
             "assigned_by": str(interaction.user),
             "assigned_to": str(assigned_user),
@@ -118,7 +434,11 @@ class TaskboardCog(commands.Cog):
         try:
             print("Saving task data...")  
             user_id = str(assigned_user.id)
-            db.collection("users").document(user_id).collection("tasks").document(task_id).set(task_data)
+            project_ref = self.db.collection("projects").document(project_id)
+            tasks_ref = self.db.collection("users").document(user_id).collection("tasks")
+            index_ref = self.db.collection("task_index")
+            task_id = await self.db.transaction(create_task, project_ref, tasks_ref, index_ref, project_id, task_data)
+            self.track_task(user_id, task_id, task_data)
     
         except Exception as e:
             print(f"Error while saving task: {e}") 
@@ -136,72 +456,293 @@ class TaskboardCog(commands.Cog):
         embed.add_field(name="Task ID", value=task_id, inline=False)
         embed.set_footer(text=f"Project: {project_data.get('name')}")
     
-        await interaction.followup.send(embed=embed)
-        await interaction.followup.send(f"{assigned_user.mention}")
+        # Mention and embed in one message
+        await self.bot.dispatcher.send(interaction.followup, assigned_user.mention, embed=embed)
 
-    @app_commands.command(name="tasklist", description="Fetch a list of tasks for a user.")
-    async def tasklist(self, interaction: discord.Interaction, target: discord.User = None):
-        """Fetch tasks for a specific user."""
-        if target is None:
-            target = interaction.user
+    @app_commands.command(name="give_task_bulk", description="Assign the same task to several users or a whole role.")
+    @app_commands.describe(assignees="Mentions of the users to assign", role="Assign to every member of this role")
+    async def give_task_bulk(self, interaction: discord.Interaction,
+                             task_name: str,
+                             task_description: str,
+                             deadline_days: int,
+                             assignees: str = None,
+                             role: discord.Role = None):
+        """Assign one task to many users: one transaction reserves the task ids, then the tasks are
+        written in chunks, each committed in a transaction together with its project summary update."""
+        await interaction.response.defer()
 
-        user_tasks = db.collection("users").document(str(target.id)).collection("tasks").get()
-        if not user_tasks:
-            await interaction.response.send_message(f"{target.mention} has no tasks assigned.", ephemeral=True)
+        project_data = await self.get_project_data(interaction)
+        if not project_data:
+            return
+        if not await self.check_leader_or_core(interaction, project_data):
             return
 
-        task_list = []
-        numbererr = 1
-        for task in user_tasks:
-            task_data = task.to_dict()
-            deadline = task_data['deadline']
-            task_name = task_data['task_name']
-            task_status = task_data['task_status']
-            task_list.append(f"**{numbererr}. {task_name}** - {task_status}\nDeadline: {deadline}")
-            numbererr += 1
+        mentioned = await self.bot.members.get_many(interaction.guild, MENTION_PATTERN.findall(assignees or ""))
+        members = {member.id: member for member in mentioned}
+        if role:
+            members.update((member.id, member) for member in await self.bot.members.role_members(role))
+        if not members:
+            await interaction.followup.send("Mention at least one member or pick a role.", ephemeral=True)
+            return
+
+        # Membership is checked against the members' roles, no further API calls
+        project_role = await self.get_project_role(interaction, project_data)
+        outsiders = [member for member in members.values() if project_role and not member.get_role(project_role.id)]
+        if outsiders:
+            names = ", ".join(member.mention for member in outsiders)
+            await interaction.followup.send(f"Not members of the project role: {names}", ephemeral=True)
+            return
+
+        project_id = project_data['project_id']
+        deadline_date = (datetime.utcnow() + timedelta(days=deadline_days)).strftime("%Y-%m-%d %H:%M:%S")
+        created_at = datetime.utcnow().isoformat()
+        assignments = []
+        for member in members.values():
+            assignments.append((str(member.id), {
+                "task_name": task_name,
+                "task_description": task_description,
+                "deadline": deadline_date,
+                "task_status": "On going",
+                "project_id": project_id,
+                "assigned_by": str(interaction.user),
+                "assigned_to": str(member),
+                "created_at": created_at
+            }))
+
+        project_ref = self.db.collection("projects").document(project_id)
+        stats_ref = project_ref.collection("meta").document("stats")
+        try:
+            task_ids = await self.db.transaction(reserve_task_ids, project_ref, project_id, len(assignments))
+        except Exception as e:
+            print(f"Error while reserving task ids: {e}")
+            await interaction.followup.send(f"Failed to assign the tasks: {e}", ephemeral=True)
+            return
+
+        tasks = []
+        for task_id, (user_id, task_data) in zip(task_ids, assignments):
+            task_ref = self.db.collection("users").document(user_id).collection("tasks").document(task_id)
+            tasks.append((task_ref, self.db.collection("task_index").document(task_id), user_id, task_id, task_data))
+
+        # Each chunk commits its tasks, their index entries and the summary update together
+        saved = 0
+        error = None
+        for start in range(0, len(tasks), BULK_TASK_CHUNK):
+            chunk = tasks[start:start + BULK_TASK_CHUNK]
+            try:
+                await self.db.transaction(add_tasks, stats_ref, chunk)
+            except Exception as e:
+                print(f"Error while saving bulk tasks: {e}")
+                error = e
+                break
+            for _, _, user_id, task_id, task_data in chunk:
+                self.track_task(user_id, task_id, task_data)
+            saved += len(chunk)
+
+        if not saved:
+            await interaction.followup.send(f"Failed to assign the tasks: {error}", ephemeral=True)
+            return
+        if error:
+            await interaction.followup.send(
+                f"Only {saved} of {len(tasks)} task(s) were assigned: {error}", ephemeral=True)
+        members = {member_id: member for member_id, member in list(members.items())[:saved]}
+        task_ids = task_ids[:saved]
 
-        task_list_str = "\n\n".join(task_list)
         embed = discord.Embed(
-            title=f"Tasks Assigned to {target.name}",
-            description=task_list_str,
+            title=f"{task_name}",
+            description=task_description,
             color=discord.Color.orange()
         )
-        await interaction.response.send_message(embed=embed)
+        embed.add_field(name="Deadline", value=deadline_date, inline=False)
+        lines = [f"{member.mention} — {task_id}" for member, task_id in zip(members.values(), task_ids)]
+        assigned = "\n".join(lines)
+        if len(assigned) > 1024:
+            assigned = "\n".join(lines[:20]) + f"\n…and {len(lines) - 20} more"
+        embed.add_field(name=f"Assigned To ({len(lines)})", value=assigned, inline=False)
+        embed.add_field(name="Assigned By", value=interaction.user.mention, inline=False)
+        embed.set_footer(text=f"Project: {project_data.get('name')}")
+
+        mentions = " ".join(member.mention for member in members.values())
+        if len(mentions) > MAX_CONTENT_LENGTH:
+            # Stop at the last whole mention; the embed still counts everyone assigned
+            mentions = mentions[:MAX_CONTENT_LENGTH + 1].rsplit(" ", 1)[0]
+        await self.bot.dispatcher.send(interaction.followup, mentions, embed=embed)
+
+    @app_commands.command(name="task_done", description="Mark a task as done.")
+    async def task_done(self, interaction: discord.Interaction, task_id: str):
+        """Complete a task by id; the assignee, the project leader or the core team may do this."""
+        await interaction.response.defer(ephemeral=True)
+
+        task_ref, entry = await self.find_task(task_id)
+        if not task_ref:
+            await interaction.followup.send(entry, ephemeral=True)
+            return
+
+        if str(interaction.user.id) != entry["user_id"]:
+            project_data = self.bot.project_index.get(entry["project_id"]) or {}
+            if not await self.check_leader_or_core(interaction, project_data, "Only the assignee or the project leader can complete this task."):
+                return
+
+        stats_ref = self.db.collection("projects").document(entry["project_id"]).collection("meta").document("stats")
+        try:
+            task_data = await self.db.transaction(set_task_status, task_ref, stats_ref, "Done",
+                                                  self.open_tasks_by_deadline(entry["project_id"]))
+        except Exception as e:
+            print(f"Error while completing task: {e}")
+            await interaction.followup.send(f"Failed to update the task: {e}", ephemeral=True)
+            return
+        if task_data is None:
+            await interaction.followup.send(f"No task found with ID {task_id}.", ephemeral=True)
+            return
+
+        self.track_task(entry["user_id"], task_id, dict(task_data, task_status="Done"))
+        if task_data.get("task_status") == "Done":
+            await interaction.followup.send(f"Task {task_id} was already done.", ephemeral=True)
+        else:
+            await interaction.followup.send(f"Task **{task_data.get('task_name')}** ({task_id}) marked as done.", ephemeral=True)
+
+    @app_commands.command(name="task_info", description="Show the details of a task.")
+    async def task_info(self, interaction: discord.Interaction, task_id: str):
+        await interaction.response.defer()
+
+        task_ref, entry = await self.find_task(task_id)
+        if not task_ref:
+            await interaction.followup.send(entry, ephemeral=True)
+            return
+        task = await self.db.get(task_ref)
+        if not task.exists:
+            await interaction.followup.send(f"No task found with ID {task_id}.", ephemeral=True)
+            return
+
+        task_data = task.to_dict()
+        project_data = self.bot.project_index.get(entry["project_id"]) or {}
+        embed = discord.Embed(
+            title=task_data.get("task_name"),
+            description=task_data.get("task_description"),
+            color=discord.Color.orange()
+        )
+        embed.add_field(name="Status", value=task_data.get("task_status"), inline=True)
+        embed.add_field(name="Deadline", value=task_data.get("deadline"), inline=True)
+        embed.add_field(name="Assigned To", value=f"<@{entry['user_id']}>", inline=False)
+        embed.add_field(name="Assigned By", value=task_data.get("assigned_by"), inline=False)
+        embed.add_field(name="Task ID", value=task_id, inline=False)
+        embed.set_footer(text=f"Project: {project_data.get('name', entry['project_id'])}")
+        await interaction.followup.send(embed=embed)
+
+    @app_commands.command(name="export_tasks", description="Export the tasks of a project or a member as a compressed file.")
+    @app_commands.describe(role="Project role to export (defaults to this channel's project)",
+                           project="Project to export (instead of a role)",
+                           user="Only export this member's tasks", export_format="File format")
+    @app_commands.choices(export_format=[app_commands.Choice(name=name, value=name) for name in EXPORT_FORMATS])
+    @require_roles(CORE_TEAM)
+    async def export_tasks(self, interaction: discord.Interaction, role: discord.Role = None, project: str = None,
+                           user: discord.User = None, export_format: str = "jsonl"):
+        """Page through the tasks with a cursor and stream them into a gzip file, one page in memory at a time."""
+        await interaction.response.defer(ephemeral=True)
+
+        project_data = None
+        if role is not None or project is not None:
+            project_data = self.bot.project_index.find(project) if project else await self.bot.project_index.get_by_role(role.id)
+            if not project_data:
+                await interaction.followup.send("No project found.", ephemeral=True)
+                return
+        elif user is None:
+            project_data = await self.get_project_data(interaction)
+            if not project_data:
+                return
+
+        if user is not None:
+            query = self.db.collection("users").document(str(user.id)).collection("tasks")
+            if project_data:
+                query = query.where("project_id", "==", project_data["project_id"])
+            label = f"{user.name}-{project_data['project_id']}" if project_data else user.name
+        else:
+            query = self.db.collection_group("tasks").where("project_id", "==", project_data["project_id"])
+            label = project_data["project_id"]
+        # A stable order for the cursor; equality filters plus document id need no composite index
+        query = query.order_by("__name__")
+
+        export = GzipExportFile(export_format)
+        try:
+            async for page in self.db.paginate(query, EXPORT_PAGE_SIZE):
+                await asyncio.to_thread(export.write_rows, task_rows(page))
+            size = await asyncio.to_thread(export.close)
+
+            if not export.rows:
+                await interaction.followup.send("No tasks to export.", ephemeral=True)
+                return
+            if size > interaction.guild.filesize_limit:
+                await interaction.followup.send(
+                    f"The export is {size / 1_000_000:.1f} MB, over this server's upload limit.", ephemeral=True)
+                return
+
+            filename = f"tasks-{label}-{datetime.utcnow():%Y%m%d}.{export_format}.gz"
+            await interaction.followup.send(f"Exported {export.rows} task(s).",
+                                            file=discord.File(export.path, filename=filename), ephemeral=True)
+        except Exception as e:
+            print(f"Error while exporting tasks: {e}")
+            await interaction.followup.send(f"Failed to export the tasks: {e}", ephemeral=True)
+        finally:
+            await asyncio.to_thread(export.cleanup)
+
+    @app_commands.command(name="tasklist", description="Fetch a list of tasks for a user.")
+    @app_commands.describe(status="Only show tasks with this status")
+    @app_commands.choices(status=[app_commands.Choice(name=status, value=status) for status in TASK_STATUSES])
+    async def tasklist(self, interaction: discord.Interaction, target: discord.User = None, status: str = None):
+        """Fetch tasks for a specific user, one page at a time."""
+        await interaction.response.defer()
+        if target is None:
+            target = interaction.user
+
+        view = TaskListView(self.db, interaction.user, target, status)
+        try:
+            found = await view.load_page(0)
+        except Exception as e:
+            print(f"Error while fetching tasks: {e}")
+            await interaction.followup.send(f"Failed to fetch the tasks: {e}", ephemeral=True)
+            return
+        if not found:
+            await interaction.followup.send(f"{target.mention} has no tasks assigned.", ephemeral=True)
+            return
+
+        view.update_buttons()
+        await interaction.followup.send(embed=view.build_embed(), view=view)
+        view.message = await interaction.original_response()
 
 
     @app_commands.command(name="project_tasklist", description="Fetch a list of tasks for a specific project.")
-    async def project_tasklist(self, interaction: discord.Interaction, role: discord.Role = None):
-        if role is None:
-            await interaction.response.send_message('Please provide a project role for input.', ephemeral=True)
+    @app_commands.describe(role="Project role", project="Project name or id")
+    async def project_tasklist(self, interaction: discord.Interaction, role: discord.Role = None, project: str = None):
+        if role is None and project is None:
+            await interaction.response.send_message('Please provide a project role or pick a project.', ephemeral=True)
             return
     
         await interaction.response.defer()
     
-        project_doc = db.collection("projects").where("role_id", "==", str(role.id)).get()
-        if not project_doc:
+        project_data = self.bot.project_index.find(project) if project else await self.bot.project_index.get_by_role(role.id)
+        if not project_data:
             await interaction.followup.send("No project found.", ephemeral=True)
             return None
+        if role is None:
+            role = await self.get_project_role(interaction, project_data)
+            if role is None:
+                await interaction.followup.send("The project role no longer exists.", ephemeral=True)
+                return
     
-        project_data = project_doc[0].to_dict()
-        project_id = project_doc[0].id  
-        project_data['project_id'] = project_id   
+        project_id = project_data['project_id']
     
         if not await self.check_leader_or_core(interaction, project_data):
-            await interaction.followup.send("You are not authorized to use this command.", ephemeral=True)
             return
     
         project_name = project_data.get('name')
     
-        members_with_role = role.members
-        if not members_with_role:
-            await interaction.followup.send("No members found with this role.", ephemeral=True)
-            return
-    
+        tasks_by_user = await self.get_project_tasks(project_id, role)
+        # Resolve only the assignees, not the whole role, so this works without a full member cache
+        assignees = await self.bot.members.get_many(interaction.guild, tasks_by_user)
+        members_with_role = [member for member in assignees if member.get_role(role.id)]
+
         all_tasks = []
         for member in members_with_role:
-            user_tasks = db.collection("users").document(str(member.id)).collection("tasks").where("project_id", "==", project_id).get()
-            for task in user_tasks:
-                task_data = task.to_dict()
+            for task_data in tasks_by_user.get(str(member.id), []):
                 task_name = task_data['task_name']
                 task_status = task_data['task_status']
                 deadline = task_data['deadline']
@@ -219,6 +760,91 @@ class TaskboardCog(commands.Cog):
         )
         await interaction.followup.send(embed=embed)
 
+    @app_commands.command(name="project_status", description="Show a project's task summary.")
+    @app_commands.describe(role="Project role", project="Project name or id")
+    async def project_status(self, interaction: discord.Interaction, role: discord.Role = None, project: str = None):
+        """Summarize a project from its stats document: one read regardless of task count."""
+        await interaction.response.defer()
+
+        if role is not None or project is not None:
+            project_data = self.bot.project_index.find(project) if project else await self.bot.project_index.get_by_role(role.id)
+            if not project_data:
+                await interaction.followup.send("No project found.", ephemeral=True)
+                return
+        else:
+            project_data = await self.get_project_data(interaction)
+            if not project_data:
+                return
+
+        project_id = project_data['project_id']
+        stats_ref = self.db.collection("projects").document(project_id).collection("meta").document("stats")
+        stats_doc = await self.db.get(stats_ref)
+        stats = stats_doc.to_dict() if stats_doc.exists else {}
+        incomplete = False
+        if "rebuilt_at" not in stats:
+            # Never recounted, or found to be off: count every task of the project once
+            tasks_query = self.db.collection_group("tasks").where("project_id", "==", project_id)
+            try:
+                stats = await self.db.transaction(rebuild_stats, stats_ref, tasks_query)
+            except api_exceptions().FailedPrecondition as e:
+                print(f"Collection group query unavailable, cannot recount project {project_id}: {e}")
+                incomplete = True
+
+        embed = discord.Embed(
+            title=f"{project_data.get('name')} Status",
+            description=f"{stats.get('total_tasks', 0)} task(s) in total",
+            color=discord.Color.orange()
+        )
+        status_counts = stats.get("status_counts", {})
+        if status_counts:
+            embed.add_field(name="By Status", value="\n".join(f"{status}: {count}" for status, count in status_counts.items()), inline=True)
+        assignee_counts = sorted(stats.get("assignee_counts", {}).items(), key=lambda item: -item[1])
+        if assignee_counts:
+            # Keep the field under Discord's 1024 character limit
+            lines = [f"<@{user_id}>: {count}" for user_id, count in assignee_counts[:20]]
+            embed.add_field(name="By Assignee", value="\n".join(lines), inline=True)
+        if stats.get("next_deadline"):
+            embed.add_field(name="Next Deadline", value=f"{stats['next_deadline']} ({stats['next_deadline_task']})", inline=False)
+        if incomplete:
+            embed.set_footer(text="Counts may leave out older tasks until the tasks.project_id index is deployed")
+        await interaction.followup.send(embed=embed)
+
+
+    # Autocomplete callbacks: answered from the in-memory tries, never from Firestore
+
+    @project_tasklist.autocomplete("project")
+    @project_status.autocomplete("project")
+    @export_tasks.autocomplete("project")
+    async def project_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=name, value=project_id)
+                for name, project_id in self.bot.autocomplete.complete_projects(current)]
+
+    @task_done.autocomplete("task_id")
+    async def open_task_autocomplete(self, interaction: discord.Interaction, current: str):
+        # Members see their own open tasks; the core team and management see everyone's
+        privileged = self.bot.permissions.has_any(interaction.user, CORE_TEAM, MANAGEMENT)
+        user_id = None if privileged else str(interaction.user.id)
+        return [app_commands.Choice(name=label, value=task_id)
+                for label, task_id in self.bot.autocomplete.complete_tasks(current, user_id, open_only=True)]
+
+    @task_info.autocomplete("task_id")
+    async def task_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=label, value=task_id)
+                for label, task_id in self.bot.autocomplete.complete_tasks(current)]
+
+    @give_task_bulk.autocomplete("assignees")
+    async def assignees_autocomplete(self, interaction: discord.Interaction, current: str):
+        # Complete the word being typed into a mention, keeping the mentions before it
+        head, _, word = current.rpartition(" ")
+        if MENTION_PATTERN.fullmatch(word):
+            head, word = current, ""
+        choices = []
+        for name, user_id in self.bot.autocomplete.complete_assignees(word):
+            value = f"{head} <@{user_id}>".strip()
+            if len(value) <= MAX_CHOICE_LENGTH:
+                choices.append(app_commands.Choice(name=f"@{name}", value=value))
+        return choices
+
 
 async def setup(bot):
     await bot.add_cog(TaskboardCog(bot))
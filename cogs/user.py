@@ -1,31 +1,69 @@
 import discord
 from discord.ext import commands
-from firebase_admin import credentials, firestore, initialize_app, get_app
 from datetime import datetime
 import os
-from dotenv import load_dotenv  
+from utils.cache import TTLCache, MISSING
+from utils.firestore import api_exceptions
+from utils.permissions import CORE_TEAM, require_roles, require_roles_command
 
-load_dotenv()
-firebase_creds = os.getenv('FIREBASE_CREDENTIALS')
-
-try:
-    app = get_app("user_app")  
-except ValueError:
-    with open('firebase_creds.json', 'w') as f:
-        f.write(firebase_creds)
-
-    cred = credentials.Certificate('firebase_creds.json')
-    app = initialize_app(cred, name="user_app")
-
-    os.remove('firebase_creds.json')
-
-db = firestore.client(app)
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "256"))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
 
 
 class UsersCog(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        self.db = bot.firebase.repository
+        # users/{id} documents (None when there is no profile) and their rendered /userinfo embeds
+        self.profiles = TTLCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL)
+        self.profile_embeds = TTLCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL)
+
+    async def get_profile(self, user_id: str):
+        """Return the user's profile document, from the cache when possible."""
+        profile = self.profiles.get(user_id)
+        if profile is MISSING:
+            user_doc = await self.db.get(self.db.collection("users").document(user_id))
+            profile = user_doc.to_dict() if user_doc.exists else None
+            self.profiles.set(user_id, profile)
+        return profile
+
+    async def update_profile_fields(self, user_id: str, fields: dict):
+        """Write `fields` to an existing profile and apply them to the cached copy.
+
+        Raises NotFound when the user has no profile.
+        """
+        try:
+            await self.db.update(self.db.collection("users").document(user_id), fields)
+        except api_exceptions().NotFound:
+            self.profiles.set(user_id, None)
+            raise
+        finally:
+            self.profile_embeds.pop(user_id)
+
+        profile = self.profiles.pop(user_id)
+        if profile:
+            self.profiles.set(user_id, dict(profile, **fields))
+
+    def build_profile_embed(self, user: discord.User, user_data: dict) -> discord.Embed:
+        join_date = datetime.fromisoformat(user_data.get('joined_at')).strftime("%d %b %Y")
+
+        embed = discord.Embed(
+            title=f"{user_data.get('display_name', user.name)}'s Profile",
+            description=user_data.get('bio', "Member of Nexio Developer Group."),
+            color=discord.Color.orange()
+        )
+        embed.set_thumbnail(url=user.display_avatar.url)
+        embed.add_field(name="GitHub", value=user_data.get('github', "Not provided"), inline=False)
+        embed.add_field(name="Location", value=user_data.get('location', "Not provided"), inline=True)
+        embed.set_footer(text=f"Member since: {join_date}")
+
+        verified = user_data.get('verified', False)
+        if verified:
+            embed.add_field(name="Verified", value="✅", inline=True)
+        else:
+            embed.add_field(name="Verified", value="Not Verified By Core Team", inline=True)
+        return embed
 
     @discord.app_commands.command(name="makeprofile", description="Create a profile for the user")
     async def makeprofile(
@@ -70,8 +108,10 @@ class UsersCog(commands.Cog):
 
         print(user_data)
         try:
-            users_ref = db.collection("users")
-            users_ref.document(user_id).set(user_data)
+            users_ref = self.db.collection("users")
+            await self.db.set(users_ref.document(user_id), user_data)
+            self.profiles.set(user_id, user_data)
+            self.profile_embeds.pop(user_id)
             await interaction.followup.send(
                 f"Profile created successfully for {interaction.user.mention}!"
             )
@@ -87,35 +127,19 @@ class UsersCog(commands.Cog):
         user_id = str(user.id)
 
         try:
-          
-            users_ref = db.collection("users")
-            user_doc = users_ref.document(user_id).get()
-
-            if not user_doc.exists:
-                await interaction.followup.send(f"No profile found for {user.mention}.")
-                return
-
-            user_data = user_doc.to_dict()
-
-            member_roles = user.roles
-
-            join_date = datetime.fromisoformat(user_data.get('joined_at')).strftime("%d %b %Y")
-
-            embed = discord.Embed(
-                title=f"{user_data.get('display_name', user.name)}'s Profile",
-                description=user_data.get('bio', "Member of Nexio Developer Group."),
-                color=discord.Color.orange()
-            )
-            embed.set_thumbnail(url=user.display_avatar.url)
-            embed.add_field(name="GitHub", value=user_data.get('github', "Not provided"), inline=False)
-            embed.add_field(name="Location", value=user_data.get('location', "Not provided"), inline=True)
-            embed.set_footer(text=f"Member since: {join_date}")
-
-            verified = user_data.get('verified', False)
-            if verified:
-                embed.add_field(name="Verified", value="✅", inline=True)
+            # Rendered embeds are reused while the user's name and avatar stay the same
+            render_key = (user.name, user.display_avatar.url)
+            cached = self.profile_embeds.get(user_id)
+            if cached is not MISSING and cached[0] == render_key:
+                embed = cached[1]
             else:
-                embed.add_field(name="Verified", value="Not Verified By Core Team", inline=True)
+                user_data = await self.get_profile(user_id)
+                if user_data is None:
+                    await interaction.followup.send(f"No profile found for {user.mention}.")
+                    return
+
+                embed = self.build_profile_embed(user, user_data)
+                self.profile_embeds.set(user_id, (render_key, embed))
 
             await interaction.followup.send(embed=embed)  # This is now public
 
@@ -125,24 +149,15 @@ class UsersCog(commands.Cog):
             )
 
     @discord.app_commands.command(name="verify", description="Verify a user (core team only)")
+    @require_roles(CORE_TEAM, message="You do not have permission to verify users.")
     async def verify(self, interaction: discord.Interaction, user: discord.User):
-
-        if not any(role.name.lower() == "core team" for role in interaction.user.roles):
-            await interaction.response.send_message("You do not have permission to verify users.", ephemeral=True)
-            return
-
         user_id = str(user.id)
         try:
-            users_ref = db.collection("users")
-            user_doc = users_ref.document(user_id).get()
-
-            if not user_doc.exists:
-                await interaction.response.send_message(f"No profile found for {user.mention}.", ephemeral=True)
-                return
-
-            users_ref.document(user_id).update({"verified": True})
+            await self.update_profile_fields(user_id, {"verified": True})
             await interaction.response.send_message(f"{user.mention} has been verified!", ephemeral=True)
 
+        except api_exceptions().NotFound:
+            await interaction.response.send_message(f"No profile found for {user.mention}.", ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(
                 f"An error occurred while verifying the user: {e}", ephemeral=True
@@ -157,16 +172,11 @@ class UsersCog(commands.Cog):
             return
 
         try:
-            users_ref = db.collection("users")
-            user_doc = users_ref.document(user_id).get()
-
-            if not user_doc.exists:
-                await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
-                return
-
-            users_ref.document(user_id).update({"bio": bio})
+            await self.update_profile_fields(user_id, {"bio": bio})
             await interaction.response.send_message(f"Your bio has been updated to: {bio}", ephemeral=True)
 
+        except api_exceptions().NotFound:
+            await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"An error occurred while updating the bio: {e}", ephemeral=True)
 
@@ -179,16 +189,11 @@ class UsersCog(commands.Cog):
             return
 
         try:
-            users_ref = db.collection("users")
-            user_doc = users_ref.document(user_id).get()
-
-            if not user_doc.exists:
-                await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
-                return
-
-            users_ref.document(user_id).update({"display_name": display_name})
+            await self.update_profile_fields(user_id, {"display_name": display_name})
             await interaction.response.send_message(f"Your display name has been updated to: {display_name}", ephemeral=True)
 
+        except api_exceptions().NotFound:
+            await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"An error occurred while updating the display name: {e}", ephemeral=True)
 
@@ -201,16 +206,11 @@ class UsersCog(commands.Cog):
             return
 
         try:
-            users_ref = db.collection("users")
-            user_doc = users_ref.document(user_id).get()
-
-            if not user_doc.exists:
-                await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
-                return
-
-            users_ref.document(user_id).update({"github": github})
+            await self.update_profile_fields(user_id, {"github": github})
             await interaction.response.send_message(f"Your GitHub link has been updated to: {github}", ephemeral=True)
 
+        except api_exceptions().NotFound:
+            await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"An error occurred while updating the GitHub link: {e}", ephemeral=True)
 
@@ -219,36 +219,80 @@ class UsersCog(commands.Cog):
         user_id = str(interaction.user.id)
 
         try:
-            users_ref = db.collection("users")
-            user_doc = users_ref.document(user_id).get()
-
-            if not user_doc.exists:
-                await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
-                return
-
-            users_ref.document(user_id).update({"location": location})
+            await self.update_profile_fields(user_id, {"location": location})
             await interaction.response.send_message(f"Your location has been updated to: {location}", ephemeral=True)
 
+        except api_exceptions().NotFound:
+            await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"An error occurred while updating the location: {e}", ephemeral=True)
 
     @discord.app_commands.command(name="update_app_password", description="Update Your App Password")
-    async def update_location(self, interaction: discord.Interaction, newpass: str):
+    async def update_app_password(self, interaction: discord.Interaction, newpass: str):
         user_id = str(interaction.user.id)
 
         try:
-            users_ref = db.collection("users")
-            user_doc = users_ref.document(user_id).get()
+            await self.update_profile_fields(user_id, {"password": newpass})
+            await interaction.response.send_message(f"Your Password updated", ephemeral=True)
+
+        except api_exceptions().NotFound:
+            await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
+        except Exception as e:
+            await interaction.response.send_message(f"An error occurred while updating the password: {e}", ephemeral=True)
 
-            if not user_doc.exists:
-                await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
+    @discord.app_commands.command(name="update_profile", description="Update several fields of your profile at once")
+    async def update_profile(
+        self,
+        interaction: discord.Interaction,
+        display_name: str = None,
+        bio: str = None,
+        github: str = None,
+        location: str = None
+    ):
+        user_id = str(interaction.user.id)
+
+        fields = {}
+        if display_name is not None:
+            if len(display_name) > 15:
+                await interaction.response.send_message("Display name must be 15 characters or fewer.", ephemeral=True)
+                return
+            fields["display_name"] = display_name
+        if bio is not None:
+            if len(bio.split()) > 25:
+                await interaction.response.send_message("Bio must be 25 words or fewer.", ephemeral=True)
+                return
+            fields["bio"] = bio
+        if github is not None:
+            if not github.startswith("https://github.com/"):
+                await interaction.response.send_message("GitHub link must be a valid GitHub profile URL.", ephemeral=True)
                 return
+            fields["github"] = github
+        if location is not None:
+            fields["location"] = location
 
-            users_ref.document(user_id).update({"password": newpass})
-            await interaction.response.send_message(f"Your Password updated", ephemeral=True)
+        if not fields:
+            await interaction.response.send_message("Give at least one field to update.", ephemeral=True)
+            return
 
+        try:
+            await self.update_profile_fields(user_id, fields)
+            updated = ", ".join(name.replace("_", " ") for name in fields)
+            await interaction.response.send_message(f"Your profile has been updated: {updated}", ephemeral=True)
+
+        except api_exceptions().NotFound:
+            await interaction.response.send_message(f"No profile found for {interaction.user.mention}.", ephemeral=True)
         except Exception as e:
-            await interaction.response.send_message(f"An error occurred while updating the location: {e}", ephemeral=True)
+            await interaction.response.send_message(f"An error occurred while updating the profile: {e}", ephemeral=True)
+
+    @commands.command(name="cachestats")
+    @require_roles_command(CORE_TEAM)
+    async def cache_stats(self, ctx):
+        """Dump the profile cache hit/miss counters."""
+        lines = []
+        for name, cache in (("Profiles", self.profiles), ("Profile embeds", self.profile_embeds)):
+            stats = ", ".join(f"{key}: {value}" for key, value in cache.stats().items())
+            lines.append(f"**{name}**: {stats}")
+        await ctx.send("\n".join(lines), delete_after=60)
 
 async def setup(bot):
     await bot.add_cog(UsersCog(bot))
@@ -0,0 +1,175 @@
+import threading
+
+# Discord shows at most 25 choices, with names and values of at most 100 characters
+MAX_CHOICES = 25
+MAX_CHOICE_LENGTH = 100
+
+
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children = {}
+        self.values = set()
+
+
+class PrefixTrie:
+    """Maps string keys to sets of values and lists the values under a prefix in key order."""
+
+    def __init__(self):
+        self.root = _Node()
+
+    def insert(self, key: str, value):
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+        node.values.add(value)
+
+    def remove(self, key: str, value):
+        path = [self.root]
+        for char in key:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].values.discard(value)
+        # Prune the branch back up to the last node still in use
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.values or node.children:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+
+    def complete(self, prefix: str, limit: int = MAX_CHOICES) -> list:
+        """Distinct values whose key starts with `prefix`, shortest and alphabetically first keys first."""
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        results = []
+        seen = set()
+        level = [node]
+        # Breadth-first, so exact and short matches come before long ones
+        while level and len(results) < limit:
+            next_level = []
+            for current in level:
+                for value in sorted(current.values, key=str):
+                    if value not in seen:
+                        seen.add(value)
+                        results.append(value)
+                        if len(results) == limit:
+                            return results
+                next_level.extend(current.children[char] for char in sorted(current.children))
+            level = next_level
+        return results
+
+
+def _keys(*texts) -> set:
+    """The full text and each of its words, so "fix login" is found by "fix" and by "login"."""
+    keys = set()
+    for text in texts:
+        text = (text or "").casefold().strip()
+        if text:
+            keys.add(text)
+            keys.update(text.split())
+    return keys
+
+
+def _label(text: str) -> str:
+    return text if len(text) <= MAX_CHOICE_LENGTH else text[:MAX_CHOICE_LENGTH - 1] + "…"
+
+
+class AutocompleteIndex:
+    """Prefix tries over project names, task ids and names, and assignee names.
+
+    Loaded at startup from the projects and the users' tasks, and updated by the
+    commands that write them, so autocomplete callbacks never read Firestore.
+    """
+
+    def __init__(self):
+        self.projects = PrefixTrie()
+        self.tasks = PrefixTrie()
+        self.assignees = PrefixTrie()
+        self.project_names = {}  # project_id -> name
+        self.task_summaries = {}  # task_id -> (task_name, user_id, task_status)
+        self.user_tasks = {}  # user_id -> {task_id, ...}
+        self.assignee_names = {}  # user_id -> name
+        self._task_keys = {}
+        self._lock = threading.Lock()
+
+    def load(self, projects, tasks):
+        """Bulk load (project_id, data) and (user_id, task_id, data) entries."""
+        for project_id, project in projects:
+            self.add_project(project_id, project)
+        for user_id, task_id, task in tasks:
+            self.add_task(user_id, task_id, task)
+
+    def add_project(self, project_id: str, data: dict):
+        name = data.get("name") or project_id
+        with self._lock:
+            old_name = self.project_names.get(project_id)
+            if old_name is not None:
+                for key in _keys(old_name, project_id):
+                    self.projects.remove(key, project_id)
+            self.project_names[project_id] = name
+            for key in _keys(name, project_id):
+                self.projects.insert(key, project_id)
+
+    def add_task(self, user_id: str, task_id: str, data: dict):
+        user_id = str(user_id)
+        keys = _keys(data.get("task_name"), task_id)
+        with self._lock:
+            for key in self._task_keys.get(task_id, ()):
+                self.tasks.remove(key, task_id)
+            self._task_keys[task_id] = keys
+            for key in keys:
+                self.tasks.insert(key, task_id)
+            self.task_summaries[task_id] = (data.get("task_name") or task_id, user_id, data.get("task_status"))
+            self.user_tasks.setdefault(user_id, set()).add(task_id)
+
+            name = data.get("assigned_to")
+            if name and self.assignee_names.get(user_id) != name:
+                if user_id in self.assignee_names:
+                    for key in _keys(self.assignee_names[user_id]):
+                        self.assignees.remove(key, user_id)
+                self.assignee_names[user_id] = name
+                for key in _keys(name):
+                    self.assignees.insert(key, user_id)
+
+    def complete_projects(self, prefix: str, limit: int = MAX_CHOICES) -> list:
+        """(label, project_id) pairs for the projects matching `prefix`."""
+        with self._lock:
+            project_ids = self.projects.complete(prefix.casefold().strip(), limit)
+            return [(_label(self.project_names[project_id]), project_id) for project_id in project_ids]
+
+    def complete_tasks(self, prefix: str, user_id: str = None, open_only: bool = False,
+                       limit: int = MAX_CHOICES) -> list:
+        """(label, task_id) pairs for the tasks matching `prefix`, optionally one user's and still open."""
+        prefix = prefix.casefold().strip()
+        with self._lock:
+            if user_id is not None:
+                # A user's own tasks are few; filter them directly instead of walking the trie
+                candidates = sorted(task_id for task_id in self.user_tasks.get(str(user_id), ())
+                                    if any(key.startswith(prefix) for key in self._task_keys[task_id]))
+            else:
+                candidates = self.tasks.complete(prefix, limit if not open_only else limit * 4)
+            choices = []
+            for task_id in candidates:
+                name, _, status = self.task_summaries[task_id]
+                if open_only and status == "Done":
+                    continue
+                choices.append((_label(f"{task_id} · {name}"), task_id))
+                if len(choices) == limit:
+                    break
+            return choices
+
+    def complete_assignees(self, prefix: str, limit: int = MAX_CHOICES) -> list:
+        """(name, user_id) pairs for the known assignees matching `prefix`."""
+        with self._lock:
+            user_ids = self.assignees.complete(prefix.casefold().strip(), limit)
+            return [(_label(self.assignee_names[user_id]), user_id) for user_id in user_ids]
+
+    def stats(self) -> dict:
+        return {"projects": len(self.project_names), "tasks": len(self.task_summaries),
+                "assignees": len(self.assignee_names)}
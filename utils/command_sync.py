@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+import discord
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Where the hash of the last synced command tree is stored
+SYNC_STATE_FILE = os.getenv("COMMAND_SYNC_STATE", ".command_sync.json")
+# Optional guild to sync to instead of globally; guild syncs propagate instantly
+SYNC_GUILD_ID = os.getenv("COMMAND_SYNC_GUILD_ID")
+
+
+def command_tree_hash(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake = None) -> str:
+    """Stable hash of the serialized app-command tree as Discord would receive it."""
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+                     key=lambda command: (command.get("type", 1), command["name"]))
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def _load_state() -> dict:
+    try:
+        with open(SYNC_STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: dict):
+    with open(SYNC_STATE_FILE, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+async def sync_commands(bot, force: bool = False) -> bool:
+    """Sync the command tree only when it changed since the last sync. Returns whether a sync ran."""
+    guild = discord.Object(id=int(SYNC_GUILD_ID)) if SYNC_GUILD_ID else None
+    if guild:
+        bot.tree.copy_global_to(guild=guild)
+
+    key = str(guild.id) if guild else "global"
+    digest = command_tree_hash(bot.tree, guild)
+    state = _load_state()
+    if not force and state.get(key) == digest:
+        print(f"Slash commands unchanged ({key}), skipping sync")
+        return False
+
+    await bot.tree.sync(guild=guild)
+    state[key] = digest
+    _save_state(state)
+    print(f"Slash commands synced ({key})!")
+    return True
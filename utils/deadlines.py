@@ -0,0 +1,115 @@
+import asyncio
+import heapq
+import itertools
+import os
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Hours before a task's deadline at which the assignee is reminded; 0 means "when it is due"
+REMINDER_HOURS = [float(hours) for hours in os.getenv("TASK_REMINDER_HOURS", "24,1,0").split(",") if hours.strip()]
+# Reminders missed while the bot was offline are still sent if they are at most this late (startup load only)
+MISSED_REMINDER_GRACE = timedelta(hours=1)
+DEADLINE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_deadline(deadline: str) -> datetime:
+    """Task deadlines are stored as naive UTC strings by give_task."""
+    return datetime.strptime(deadline, DEADLINE_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def parse_created_at(created_at: str):
+    """created_at is a naive UTC ISO timestamp; None when missing or malformed."""
+    try:
+        return datetime.fromisoformat(created_at).replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+class DeadlineScheduler:
+    """Min-heap of upcoming task reminders, keyed by the time each one is due.
+
+    A single loop sleeps until the earliest entry and is woken early when an
+    earlier one is added. Cancelled or rescheduled tasks are dropped lazily
+    when their stale entries reach the top of the heap.
+    """
+
+    def __init__(self, reminder_hours=None):
+        self.offsets = sorted((timedelta(hours=hours) for hours in (reminder_hours or REMINDER_HOURS)), reverse=True)
+        self._heap = []
+        self._seq = itertools.count()
+        self._tasks = {}  # (user_id, task_id) -> task info of the live schedule
+        self._wakeup = asyncio.Event()
+
+    def __len__(self):
+        """Reminders still to be sent; stale heap entries are not counted."""
+        return sum(info["pending"] for info in self._tasks.values())
+
+    def add(self, user_id: str, task_id: str, task_data: dict, grace: timedelta = timedelta(0)):
+        """Schedule (or reschedule) the reminders of one task.
+
+        Reminders already past are dropped, unless they are at most `grace` late;
+        reminders that fell due before the task was created are always dropped.
+        """
+        try:
+            deadline = parse_deadline(task_data["deadline"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        key = (str(user_id), task_id)
+        info = dict(task_data, user_id=str(user_id), task_id=task_id, deadline_at=deadline, pending=0)
+        self._tasks[key] = info
+
+        cutoff = datetime.now(timezone.utc) - grace
+        created_at = parse_created_at(task_data.get("created_at"))
+        if created_at and created_at > cutoff:
+            cutoff = created_at
+        earliest = self._heap[0][0] if self._heap else None
+        for offset in self.offsets:
+            due = deadline - offset
+            if due < cutoff:
+                continue
+            heapq.heappush(self._heap, (due, next(self._seq), key, offset, info))
+            info["pending"] += 1
+
+        if not info["pending"]:
+            self._tasks.pop(key, None)
+        elif earliest is None or self._heap[0][0] < earliest:
+            self._wakeup.set()
+
+    def cancel(self, user_id: str, task_id: str):
+        """Forget a task (completed, deleted...); its heap entries are skipped when they come up."""
+        self._tasks.pop((str(user_id), task_id), None)
+
+    def clear(self):
+        self._heap.clear()
+        self._tasks.clear()
+
+    async def run(self, notify):
+        """Call `await notify(task_info, offset)` as each reminder falls due. Runs until cancelled."""
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            due, _, key, offset, info = self._heap[0]
+            delay = (due - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            if self._tasks.get(key) is not info:
+                continue
+            info["pending"] -= 1
+            if not info["pending"]:
+                self._tasks.pop(key, None)
+            try:
+                await notify(info, offset)
+            except Exception as e:
+                print(f"Failed to send reminder for task {key[1]}: {e}")
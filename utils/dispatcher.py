@@ -0,0 +1,188 @@
+import asyncio
+import os
+import time
+from collections import deque
+import discord
+from dotenv import load_dotenv
+
+from utils.metrics import metrics
+
+load_dotenv()
+
+# Messages allowed per destination within DISPATCH_WINDOW seconds (Discord's per-channel send bucket is 5/5s)
+DISPATCH_RATE = int(os.getenv("DISPATCH_RATE", "5"))
+DISPATCH_WINDOW = float(os.getenv("DISPATCH_WINDOW", "5"))
+# Discord limits for a single message
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+
+
+class OutboundMessage:
+    __slots__ = ("content", "embeds", "ephemeral", "coalesce", "futures")
+
+    def __init__(self, content, embeds, ephemeral, coalesce=True):
+        self.content = content
+        self.embeds = embeds
+        self.ephemeral = ephemeral
+        self.coalesce = coalesce
+        self.futures = [asyncio.get_running_loop().create_future()]
+
+    def merge(self, other) -> bool:
+        """Fold `other` into this message if the result still fits in one send."""
+        if not (self.coalesce and other.coalesce):
+            return False
+        if other.ephemeral != self.ephemeral or len(self.embeds) + len(other.embeds) > MAX_EMBEDS:
+            return False
+        content = "\n".join(part for part in (self.content, other.content) if part)
+        if len(content) > MAX_CONTENT_LENGTH:
+            return False
+        self.content = content or None
+        self.embeds = self.embeds + other.embeds
+        self.futures += other.futures
+        return True
+
+
+class MessageDispatcher:
+    """Single path for the bot's outbound messages.
+
+    Messages are queued per destination (channel, user or interaction followup)
+    and drained by one worker per destination. A worker merges whatever is
+    queued for its destination into as few sends as Discord allows, and paces
+    them so it stays inside the destination's rate bucket instead of relying on
+    429 retries. Queue depth and 429 counts are exported through the metrics
+    registry.
+    """
+
+    def __init__(self, rate: int = None, window: float = None):
+        self.rate = rate or DISPATCH_RATE
+        self.window = window or DISPATCH_WINDOW
+        self._queues = {}  # destination key -> deque of OutboundMessage
+        self._sent = {}  # destination key -> send times inside the current window, kept between bursts
+        self._workers = {}
+        self._last_prune = time.monotonic()
+        self.depth = 0
+        self.sends = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+
+    @staticmethod
+    def _key(destination):
+        # Interaction followups share a bucket per interaction token
+        token = getattr(destination, "token", None)
+        if token:
+            return ("webhook", token)
+        if getattr(destination, "id", None) is not None:
+            return ("channel", destination.id)
+        return ("object", id(destination))
+
+    def send(self, destination, content: str = None, *, embed: discord.Embed = None, embeds=None,
+             ephemeral: bool = False, coalesce: bool = True) -> asyncio.Future:
+        """Queue a message; the returned future resolves to the sent discord.Message.
+
+        Messages merged into one send all resolve to that same message. Pass
+        coalesce=False when the caller needs a message of its own, e.g. to delete it later.
+        """
+        message = OutboundMessage(content, ([embed] if embed else []) + list(embeds or []), ephemeral, coalesce)
+        key = self._key(destination)
+        self._prune_history()
+        self._queues.setdefault(key, deque()).append(message)
+        self._set_depth(1)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain(key, destination))
+        return message.futures[0]
+
+    def _set_depth(self, change: int):
+        self.depth += change
+        metrics.set_gauge("outbound_queue_depth", self.depth)
+
+    def _prune_history(self):
+        """Forget destinations whose last send is older than the window, at most once per window."""
+        now = time.monotonic()
+        if now - self._last_prune < self.window:
+            return
+        self._last_prune = now
+        for key in [key for key, sent in self._sent.items()
+                    if key not in self._workers and (not sent or now - sent[-1] >= self.window)]:
+            del self._sent[key]
+
+    async def _wait_for_slot(self, key):
+        sent = self._sent.setdefault(key, deque())
+        while True:
+            now = time.monotonic()
+            while sent and now - sent[0] >= self.window:
+                sent.popleft()
+            if len(sent) < self.rate:
+                sent.append(now)
+                return
+            await asyncio.sleep(self.window - (now - sent[0]))
+
+    async def _drain(self, key, destination):
+        queue = self._queues[key]
+        try:
+            while queue:
+                await self._wait_for_slot(key)
+                message = queue.popleft()
+                taken = 1
+                while queue and message.merge(queue[0]):
+                    queue.popleft()
+                    taken += 1
+                self._set_depth(-taken)
+                if taken > 1:
+                    self.coalesced += taken - 1
+                    metrics.increment("outbound_messages_coalesced_total", taken - 1)
+                await self._deliver(destination, message)
+        finally:
+            self._workers.pop(key, None)
+            if not queue:
+                self._queues.pop(key, None)
+
+    async def _deliver(self, destination, message: OutboundMessage):
+        kwargs = {"content": message.content}
+        if message.embeds:
+            kwargs["embeds"] = message.embeds
+        if message.ephemeral:
+            kwargs["ephemeral"] = True
+        while True:
+            try:
+                result = await destination.send(**kwargs)
+                break
+            except discord.RateLimited as e:
+                # discord.py gave up waiting on the bucket; wait it out here and retry
+                self._record_rate_limit()
+                await asyncio.sleep(e.retry_after)
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    self._record_rate_limit()
+                    await asyncio.sleep(self.window / self.rate)
+                    continue
+                self._resolve(message, exception=e)
+                return
+            except Exception as e:
+                self._resolve(message, exception=e)
+                return
+        self.sends += 1
+        metrics.increment("outbound_sends_total")
+        self._resolve(message, result=result)
+
+    def _record_rate_limit(self):
+        self.rate_limited += 1
+        metrics.increment("outbound_rate_limited_total")
+
+    @staticmethod
+    def _resolve(message: OutboundMessage, result=None, exception=None):
+        for future in message.futures:
+            if future.done():
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.depth,
+            "destinations": len(self._queues),
+            "sends": self.sends,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+        }
@@ -0,0 +1,67 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+EXPORT_FORMATS = ("jsonl", "csv")
+# Column order of CSV exports; JSONL rows carry every stored field
+TASK_EXPORT_FIELDS = [
+    "task_id", "project_id", "user_id", "task_name", "task_description", "task_status",
+    "deadline", "assigned_by", "assigned_to", "created_at", "updated_at",
+]
+
+
+def task_rows(snapshots):
+    """Turn task snapshots into export rows, adding the assignee id from the document path."""
+    for snapshot in snapshots:
+        # Tasks live at users/{user_id}/tasks/{task_id}
+        row = dict(snapshot.to_dict(), user_id=snapshot.reference.parent.parent.id)
+        row.setdefault("task_id", snapshot.id)
+        yield row
+
+
+class GzipExportFile:
+    """A gzip-compressed JSONL or CSV file in the temp directory, written one batch of rows at a time.
+
+    Rows are streamed straight into the compressor, so memory use does not grow
+    with the size of the export. The file is removed by `cleanup()`.
+    """
+
+    def __init__(self, export_format: str, fields=TASK_EXPORT_FIELDS):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        self.format = export_format
+        handle, self.path = tempfile.mkstemp(prefix="export-", suffix=f".{export_format}.gz")
+        self._file = os.fdopen(handle, "wb")
+        self._stream = io.TextIOWrapper(gzip.GzipFile(fileobj=self._file, mode="wb"), encoding="utf-8", newline="")
+        self._csv = None
+        if export_format == "csv":
+            self._csv = csv.DictWriter(self._stream, fieldnames=fields, extrasaction="ignore")
+            self._csv.writeheader()
+        self.rows = 0
+
+    def write_rows(self, rows):
+        """Write an iterable of dicts. Blocking: call it from a worker thread."""
+        for row in rows:
+            if self._csv:
+                self._csv.writerow(row)
+            else:
+                self._stream.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+            self.rows += 1
+
+    def close(self):
+        """Flush the compressor and close the file; returns its size in bytes."""
+        if not self._stream.closed:
+            # GzipFile leaves the file object it was given open
+            self._stream.close()
+            self._file.close()
+        return os.path.getsize(self.path)
+
+    def cleanup(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import os
+import threading
+from dotenv import load_dotenv
+
+from utils.firestore import FirestoreRepository
+
+load_dotenv()
+
+APP_NAME = "nexio_app"
+
+
+class FirebaseProvider:
+    """Owns the single Firebase app and Firestore client shared by every cog.
+
+    The app is created on first use from the FIREBASE_CREDENTIALS JSON held in
+    memory, and the provider lives on the bot so cog reloads reuse the same client.
+    firebase_admin itself is only imported when the client is first needed.
+    """
+
+    def __init__(self, credentials_json: str = None):
+        self._credentials_json = credentials_json
+        self._lock = threading.RLock()
+        self._client = None
+        self._repository = None
+
+    def _get_app(self):
+        import firebase_admin
+        from firebase_admin import credentials
+
+        try:
+            return firebase_admin.get_app(APP_NAME)
+        except ValueError:
+            creds = self._credentials_json or os.getenv('FIREBASE_CREDENTIALS')
+            if not creds:
+                raise RuntimeError("FIREBASE_CREDENTIALS is not set.")
+            cred = credentials.Certificate(json.loads(creds))
+            return firebase_admin.initialize_app(cred, name=APP_NAME)
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from firebase_admin import firestore
+                    self._client = firestore.client(self._get_app())
+        return self._client
+
+    @property
+    def repository(self) -> FirestoreRepository:
+        if self._repository is None:
+            with self._lock:
+                if self._repository is None:
+                    self._repository = FirestoreRepository(client_factory=lambda: self.client)
+        return self._repository
+
+    async def warm_up(self):
+        """Import firebase_admin and build the client in a worker thread, off the event loop."""
+        await asyncio.to_thread(lambda: self.client)
@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+from utils.metrics import metrics, collection_name
+
+load_dotenv()
+
+# Upper bound on Firestore calls in flight and how long a single read may take (seconds)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("FIRESTORE_MAX_CONCURRENCY", "8"))
+DEFAULT_TIMEOUT = float(os.getenv("FIRESTORE_TIMEOUT", "10"))
+# Firestore accepts at most 500 writes per batch or transaction
+BATCH_LIMIT = 500
+
+
+def api_exceptions():
+    """google.api_core.exceptions, imported on first use.
+
+    It pulls in grpc, so cogs name its classes only in except clauses, which are
+    evaluated once an exception is raised: `except api_exceptions().NotFound:`.
+    """
+    from google.api_core import exceptions
+    return exceptions
+
+
+class CountingTransaction:
+    """Hands a transaction to transactional code, recording reads and noting writes per collection."""
+
+    def __init__(self, transaction):
+        self._transaction = transaction
+        self.writes = []
+
+    def get_all(self, references, **kwargs):
+        references = list(references)
+        for ref in references:
+            metrics.record_read(collection_name(ref))
+        return self._transaction.get_all(references, **kwargs)
+
+    def get(self, query, **kwargs):
+        """Run a query inside the transaction."""
+        snapshots = list(self._transaction.get(query, **kwargs))
+        # Firestore bills an empty query as one read
+        metrics.record_read(collection_name(query), max(len(snapshots), 1))
+        return snapshots
+
+    def set(self, ref, data: dict, merge: bool = False):
+        self.writes.append(collection_name(ref))
+        return self._transaction.set(ref, data, merge=merge)
+
+    def update(self, ref, data: dict):
+        self.writes.append(collection_name(ref))
+        return self._transaction.update(ref, data)
+
+    def delete(self, ref):
+        self.writes.append(collection_name(ref))
+        return self._transaction.delete(ref)
+
+
+class FirestoreRepository:
+    """Non-blocking access to Firestore for the cogs.
+
+    The firebase_admin client is synchronous, so every call is pushed onto a
+    bounded thread pool and awaited from the event loop instead of running inline
+    inside the command handler. The client can be handed over as a factory, in
+    which case it is only built on first use.
+    """
+
+    def __init__(self, client=None, client_factory=None, max_concurrency: int = None, timeout: float = None):
+        self._client = client
+        self._client_factory = client_factory
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="firestore")
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client
+
+    def collection(self, name: str):
+        """Return a collection reference. Building references does not touch the network."""
+        return self.client.collection(name)
+
+    def collection_group(self, name: str):
+        """Return a query over every subcollection called `name`, e.g. all users' tasks."""
+        return self.client.collection_group(name)
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking Firestore read in the pool and wait for it without blocking the loop."""
+        return await self._submit(functools.partial(func, *args, **kwargs), self.timeout)
+
+    async def run_write(self, func, *args, **kwargs):
+        """Like run, but wait for the call to finish however long it takes.
+
+        A timed out write is not a failed write: the worker thread still commits it, and
+        a caller told otherwise retries into a duplicate. Firestore's own RPC deadlines
+        and the transaction attempt limit bound the wait instead.
+        """
+        return await self._submit(functools.partial(func, *args, **kwargs), None)
+
+    async def _submit(self, call, timeout):
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            # The timeout only abandons the wait; the worker thread finishes the call on its own.
+            return await asyncio.wait_for(loop.run_in_executor(self._executor, call), timeout=timeout)
+
+    async def get(self, ref):
+        """Fetch a document snapshot, or the list of snapshots of a query."""
+        result = await self.run(ref.get)
+        # Firestore bills an empty query as one read
+        metrics.record_read(collection_name(ref), max(len(result), 1) if isinstance(result, list) else 1)
+        return result
+
+    async def paginate(self, query, page_size: int = 500):
+        """Yield the results of an ordered query one page at a time, following a cursor.
+
+        Only the current page is held in memory, so this is safe for very large results.
+        """
+        cursor = None
+        while True:
+            page_query = query.limit(page_size)
+            if cursor is not None:
+                page_query = page_query.start_after(cursor)
+            page = await self.get(page_query)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            cursor = page[-1]
+
+    async def set(self, ref, data: dict, merge: bool = False):
+        metrics.record_write(collection_name(ref))
+        return await self.run_write(ref.set, data, merge=merge)
+
+    async def update(self, ref, data: dict):
+        metrics.record_write(collection_name(ref))
+        return await self.run_write(ref.update, data)
+
+    async def delete(self, ref):
+        metrics.record_write(collection_name(ref))
+        return await self.run_write(ref.delete)
+
+    async def transaction(self, func, *args, **kwargs):
+        """Run `func(transaction, *args)` as a Firestore transaction; it is retried on contention.
+
+        Reads are recorded per collection on every attempt (each one is billed); writes
+        are recorded once, for the attempt that committed.
+        """
+        from firebase_admin import firestore
+        committed_writes = []
+
+        def counted(transaction, *args, **kwargs):
+            counting = CountingTransaction(transaction)
+            result = func(counting, *args, **kwargs)
+            committed_writes[:] = counting.writes
+            return result
+
+        result = await self.run_write(firestore.transactional(counted), self.client.transaction(), *args, **kwargs)
+        for collection in committed_writes:
+            metrics.record_write(collection)
+        return result
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import discord
+from dotenv import load_dotenv
+
+from utils.cache import TTLCache, MISSING
+
+load_dotenv()
+
+# full: every member resident, chunked at startup (discord.py default, and ours)
+# joined: members who join while the bot is online, no chunking
+# none: no member cache; members are fetched on demand through MemberDirectory
+# With joined/none, listing a role's members pages the guild member list over REST.
+MEMBER_CACHE_PROFILES = ("full", "joined", "none")
+MEMBER_CACHE_PROFILE = os.getenv("MEMBER_CACHE", "full").strip().lower()
+MEMBER_LRU_SIZE = int(os.getenv("MEMBER_LRU_SIZE", "1024"))
+# Fetched members are refreshed after this many seconds so role changes are picked up
+MEMBER_LRU_TTL = float(os.getenv("MEMBER_LRU_TTL", "600"))
+
+
+def member_cache_options(intents: discord.Intents, profile: str = None) -> dict:
+    """Bot keyword arguments for a member cache profile."""
+    profile = profile or MEMBER_CACHE_PROFILE
+    if profile not in MEMBER_CACHE_PROFILES:
+        raise ValueError(f"MEMBER_CACHE must be one of {', '.join(MEMBER_CACHE_PROFILES)}, not {profile!r}")
+    if profile == "full":
+        return {"member_cache_flags": discord.MemberCacheFlags.from_intents(intents), "chunk_guilds_at_startup": True}
+    if profile == "joined":
+        return {"member_cache_flags": discord.MemberCacheFlags(voice=False, joined=True), "chunk_guilds_at_startup": False}
+    return {"member_cache_flags": discord.MemberCacheFlags.none(), "chunk_guilds_at_startup": False}
+
+
+class MemberDirectory:
+    """Member lookups that work whatever the member cache profile is.
+
+    Members in the gateway cache are used as they are. Anything else is fetched
+    over REST and kept in a bounded LRU, so resident memory depends on
+    MEMBER_LRU_SIZE rather than on the size of the server.
+    """
+
+    def __init__(self, maxsize: int = None, ttl: float = None):
+        self.cache = TTLCache(maxsize or MEMBER_LRU_SIZE, ttl or MEMBER_LRU_TTL)
+        self.fetches = 0
+        self.scans = 0
+
+    def register(self, bot):
+        bot.add_listener(self.on_raw_member_remove)
+
+    def remember(self, member: discord.Member):
+        self.cache.set((member.guild.id, member.id), member)
+
+    async def get(self, guild: discord.Guild, user_id: int):
+        """The guild member with this id, or None if they are not in the guild."""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        key = (guild.id, user_id)
+        member = self.cache.get(key)
+        if member is MISSING:
+            self.fetches += 1
+            try:
+                member = await guild.fetch_member(user_id)
+            except discord.NotFound:
+                member = None
+            self.cache.set(key, member)
+        return member
+
+    async def get_many(self, guild: discord.Guild, user_ids) -> list:
+        """Resolve several ids concurrently, leaving out users who are not in the guild."""
+        members = await asyncio.gather(*(self.get(guild, int(user_id)) for user_id in user_ids))
+        return [member for member in members if member is not None]
+
+    async def role_members(self, role: discord.Role) -> list:
+        """Every member holding `role`.
+
+        With a partial member cache, role.members only knows cached members, so
+        the member list is paged over REST instead. Only the matches are kept.
+        """
+        guild = role.guild
+        if guild.chunked:
+            return list(role.members)
+        self.scans += 1
+        members = []
+        async for member in guild.fetch_members(limit=None):
+            if member.get_role(role.id):
+                self.remember(member)
+                members.append(member)
+        return members
+
+    async def on_raw_member_remove(self, payload):
+        self.cache.pop((payload.guild_id, payload.user.id))
+
+    def stats(self) -> dict:
+        return dict(self.cache.stats(), fetches=self.fetches, role_scans=self.scans)
@@ -0,0 +1,150 @@
+import math
+import os
+import resource
+import threading
+from flask import Flask, Response
+
+# Command latency buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# /healthz reports unhealthy when the event loop lags more than this many seconds
+MAX_HEALTHY_LOOP_LAG = 1.0
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+
+class Metrics:
+    """Process-wide metrics, written from the event loop and Firestore threads and read by the Flask thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.command_latency = {}
+        self.firestore_reads = {}
+        self.firestore_writes = {}
+        self.gauges = {}
+        self.counters = {}
+
+    def observe_command(self, command: str, seconds: float):
+        with self._lock:
+            self.command_latency.setdefault(command, Histogram()).observe(seconds)
+
+    def record_read(self, collection: str, documents: int = 1):
+        with self._lock:
+            self.firestore_reads[collection] = self.firestore_reads.get(collection, 0) + documents
+
+    def record_write(self, collection: str, documents: int = 1):
+        with self._lock:
+            self.firestore_writes[collection] = self.firestore_writes.get(collection, 0) + documents
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self.gauges[name] = value
+
+    def is_healthy(self) -> bool:
+        with self._lock:
+            ready = self.gauges.get("bot_ready", 0) == 1
+            lag = self.gauges.get("event_loop_lag_seconds", 0.0)
+            latency = self.gauges.get("gateway_latency_seconds", math.inf)
+        return ready and lag < MAX_HEALTHY_LOOP_LAG and math.isfinite(latency)
+
+    def render(self) -> str:
+        """Render everything in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines.append("# TYPE command_latency_seconds histogram")
+            for command, histogram in sorted(self.command_latency.items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f"command_latency_seconds_bucket{_labels(command=command, le=bound)} {count}")
+                lines.append(f"command_latency_seconds_bucket{_labels(command=command, le='+Inf')} {histogram.total}")
+                lines.append(f"command_latency_seconds_sum{_labels(command=command)} {histogram.sum}")
+                lines.append(f"command_latency_seconds_count{_labels(command=command)} {histogram.total}")
+
+            for name, values in (("firestore_reads_total", self.firestore_reads),
+                                 ("firestore_writes_total", self.firestore_writes)):
+                lines.append(f"# TYPE {name} counter")
+                for collection, count in sorted(values.items()):
+                    lines.append(f"{name}{_labels(collection=collection)} {count}")
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {value}")
+
+            for name, value in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def resident_memory_bytes() -> int:
+    """Current resident set size of the process (peak RSS where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def collection_name(ref) -> str:
+    """Best-effort collection id for a document reference, collection reference or query."""
+    if hasattr(ref, "document"):  # CollectionReference
+        return ref.id
+    if hasattr(ref, "_parent"):  # Query / collection-group query
+        return ref._parent.id
+    if hasattr(ref, "parent"):  # DocumentReference
+        return ref.parent.id
+    return "unknown"
+
+
+def create_app(registry: Metrics = metrics) -> Flask:
+    app = Flask(__name__)
+
+    @app.route("/metrics")
+    def serve_metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    @app.route("/healthz")
+    def healthz():
+        if registry.is_healthy():
+            return "ok\n", 200
+        return "unhealthy\n", 503
+
+    return app
+
+
+def start_metrics_server(host: str, port: int, registry: Metrics = metrics) -> threading.Thread:
+    """Serve /metrics and /healthz from a daemon thread next to the bot."""
+    app = create_app(registry)
+    thread = threading.Thread(target=app.run, kwargs={"host": host, "port": port, "use_reloader": False},
+                              name="metrics-server", daemon=True)
+    thread.start()
+    return thread
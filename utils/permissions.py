@@ -0,0 +1,91 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+# Privileged role keys and the guild role names they resolve to (matched case-insensitively)
+CORE_TEAM = "core_team"
+MANAGEMENT = "management"
+PRIVILEGED_ROLES = {
+    CORE_TEAM: "Core Team",
+    MANAGEMENT: "Management",
+}
+
+_NAME_TO_KEY = {name.casefold(): key for key, name in PRIVILEGED_ROLES.items()}
+
+
+def _role_key(role) -> str:
+    return _NAME_TO_KEY.get(role.name.strip().casefold())
+
+
+class MissingPrivilegedRole(app_commands.CheckFailure, commands.CheckFailure):
+    """Raised by the shared checks; the message is shown to the user as-is."""
+
+
+class PermissionService:
+    """Resolves the privileged roles to role IDs once per guild and answers membership checks from sets.
+
+    The mapping is kept current through the guild role create/update/delete events.
+    """
+
+    def __init__(self):
+        self._guilds = {}  # guild_id -> {key: {role_id, ...}}
+
+    def register(self, bot):
+        bot.add_listener(self.on_guild_role_create)
+        bot.add_listener(self.on_guild_role_update)
+        bot.add_listener(self.on_guild_role_delete)
+
+    def _resolve(self, guild) -> dict:
+        roles = self._guilds.get(guild.id)
+        if roles is None:
+            roles = {key: set() for key in PRIVILEGED_ROLES}
+            for role in guild.roles:
+                key = _role_key(role)
+                if key:
+                    roles[key].add(role.id)
+            self._guilds[guild.id] = roles
+        return roles
+
+    def role_ids(self, guild, *keys) -> set:
+        roles = self._resolve(guild)
+        return set().union(*(roles[key] for key in keys))
+
+    def has_any(self, member, *keys) -> bool:
+        """True when `member` holds any of the privileged roles named by `keys`."""
+        guild = getattr(member, "guild", None)
+        if guild is None:
+            return False
+        return any(member.get_role(role_id) for role_id in self.role_ids(guild, *keys))
+
+    async def on_guild_role_create(self, role: discord.Role):
+        key = _role_key(role)
+        if key and role.guild.id in self._guilds:
+            self._guilds[role.guild.id][key].add(role.id)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        await self.on_guild_role_delete(before)
+        await self.on_guild_role_create(after)
+
+    async def on_guild_role_delete(self, role: discord.Role):
+        roles = self._guilds.get(role.guild.id)
+        if roles:
+            for role_ids in roles.values():
+                role_ids.discard(role.id)
+
+
+def require_roles(*keys, message: str = "You do not have permission to use this command."):
+    """App command check: the user must hold one of the privileged roles in `keys`."""
+    async def predicate(interaction: discord.Interaction) -> bool:
+        if interaction.client.permissions.has_any(interaction.user, *keys):
+            return True
+        raise MissingPrivilegedRole(message)
+    return app_commands.check(predicate)
+
+
+def require_roles_command(*keys, message: str = "You do not have permission to use this command."):
+    """Prefix command version of require_roles."""
+    async def predicate(ctx: commands.Context) -> bool:
+        if ctx.bot.permissions.has_any(ctx.author, *keys):
+            return True
+        raise MissingPrivilegedRole(message)
+    return commands.check(predicate)
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+
+from utils.metrics import metrics
+
+
+class ProjectIndex:
+    """In-memory channel_id/role_id -> project lookup over the `projects` collection.
+
+    The collection is loaded from the first snapshot of a Firestore listener, which
+    then keeps it current, with write-through from create_project so a new project is
+    visible before the listener catches up. Lookups never touch the network once
+    the index is ready.
+    """
+
+    def __init__(self, firebase):
+        self.firebase = firebase
+        self.projects = {}
+        self.by_channel = {}
+        self.by_role = {}
+        self.by_name = {}  # casefolded name -> project_id
+        self.ready = False
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._watch = None
+        self._loaded = asyncio.Event()
+
+    async def start(self):
+        """Subscribe to the collection and wait for the first snapshot to load every project.
+
+        The first snapshot lists every document as ADDED, so the collection is read once.
+        If it takes longer than the Firestore timeout, lookups fall back to queries until it arrives.
+        """
+        self._loop = asyncio.get_running_loop()
+        db = self.firebase.repository
+        self._watch = db.collection("projects").on_snapshot(self._on_snapshot)
+        await asyncio.wait_for(self._loaded.wait(), timeout=db.timeout)
+
+    def stop(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+        self.ready = False
+
+    def _on_snapshot(self, docs, changes, read_time):
+        # Each document a listener delivers is billed as a read
+        metrics.record_read("projects", len(changes))
+        # Called from the listener thread; hand the changes over to the event loop.
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._apply_changes, changes)
+
+    def _apply_changes(self, changes):
+        for change in changes:
+            if change.type.name == "REMOVED":
+                self.remove(change.document.id)
+            else:
+                self.put(change.document.id, change.document.to_dict())
+        if not self._loaded.is_set():
+            self.ready = True
+            self._loaded.set()
+            print(f"Project index loaded with {len(self.projects)} project(s)")
+
+    def put(self, project_id: str, data: dict):
+        """Insert or replace a project (write-through from create_project)."""
+        with self._lock:
+            self._unlink(project_id)
+            project = dict(data, project_id=project_id)
+            self.projects[project_id] = project
+            if project.get("channel_id"):
+                self.by_channel[str(project["channel_id"])] = project_id
+            if project.get("role_id"):
+                self.by_role[str(project["role_id"])] = project_id
+            if project.get("name"):
+                self.by_name[project["name"].casefold()] = project_id
+
+    def remove(self, project_id: str):
+        with self._lock:
+            self._unlink(project_id)
+            self.projects.pop(project_id, None)
+
+    def _unlink(self, project_id: str):
+        old = self.projects.get(project_id)
+        if old:
+            self.by_channel.pop(str(old.get("channel_id")), None)
+            self.by_role.pop(str(old.get("role_id")), None)
+            if old.get("name") and self.by_name.get(old["name"].casefold()) == project_id:
+                del self.by_name[old["name"].casefold()]
+
+    def get(self, project_id: str) -> dict:
+        project = self.projects.get(project_id)
+        return dict(project) if project else None
+
+    def find(self, value: str) -> dict:
+        """A project by id or, for a name typed without picking a suggestion, by name ignoring case."""
+        project = self.get(value)
+        if project is None:
+            project_id = self.by_name.get(value.strip().casefold())
+            project = self.get(project_id) if project_id else None
+        return project
+
+    async def get_by_channel(self, channel_id) -> dict:
+        return await self._lookup(self.by_channel, "channel_id", str(channel_id))
+
+    async def get_by_role(self, role_id) -> dict:
+        return await self._lookup(self.by_role, "role_id", str(role_id))
+
+    async def _lookup(self, mapping: dict, field: str, value: str):
+        project_id = mapping.get(value)
+        if project_id is not None:
+            self.hits += 1
+            return dict(self.projects[project_id])
+        self.misses += 1
+        if self.ready:
+            return None
+
+        # Index not loaded (startup failed or not yet started): fall back to a query.
+        self.fallbacks += 1
+        db = self.firebase.repository
+        docs = await db.get(db.collection("projects").where(field, "==", value).limit(1))
+        if not docs:
+            return None
+        self.put(docs[0].id, docs[0].to_dict())
+        return dict(self.projects[docs[0].id])
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "projects": len(self.projects),
+            "ready": self.ready,
+            "hits": self.hits,
+            "misses": self.misses,
+            "fallback_queries": self.fallbacks,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
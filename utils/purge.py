@@ -0,0 +1,87 @@
+import time
+from datetime import timedelta
+import discord
+
+# Discord's bulk-delete endpoint takes at most 100 messages younger than 14 days
+BULK_DELETE_LIMIT = 100
+BULK_DELETE_MAX_AGE = timedelta(days=14)
+
+
+class PurgeResult:
+    """Outcome of a purge: messages deleted, messages that matched but could not be deleted, and time taken."""
+
+    def __init__(self):
+        self.deleted = 0
+        self.skipped = 0
+        self.scanned = 0
+        self.elapsed = 0.0
+
+    def summary(self) -> str:
+        text = f"{self.elapsed:.1f}s"
+        if self.skipped:
+            text = f"{self.skipped} skipped, {text}"
+        return text
+
+
+async def purge_messages(channel, limit: int, check=None, scan: int = None, before=None) -> PurgeResult:
+    """Delete up to `limit` messages matching `check` among the last `scan` messages of `channel`.
+
+    History is filtered as it streams in and matches are removed through the
+    bulk-delete endpoint in chunks of 100. Only messages too old for bulk delete
+    are removed one at a time.
+    """
+    result = PurgeResult()
+    started = time.perf_counter()
+    # Small margin so a message does not cross the 14 day boundary mid-request
+    cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE + timedelta(minutes=1)
+    batch = []
+    old_messages = []
+    matched = 0
+
+    async for message in channel.history(limit=scan or limit, before=before):
+        if matched >= limit:
+            break
+        result.scanned += 1
+        if check is not None and not check(message):
+            continue
+        matched += 1
+        if message.created_at < cutoff:
+            old_messages.append(message)
+            continue
+        batch.append(message)
+        if len(batch) == BULK_DELETE_LIMIT:
+            await _bulk_delete(channel, batch, result)
+            batch = []
+
+    if batch:
+        await _bulk_delete(channel, batch, result)
+    for message in old_messages:
+        await _single_delete(message, result)
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def _bulk_delete(channel, messages, result: PurgeResult):
+    try:
+        # delete_messages falls back to a single delete when given one message
+        await channel.delete_messages(messages)
+        result.deleted += len(messages)
+    except discord.NotFound:
+        # Something in the chunk was already gone; retry the chunk one by one
+        for message in messages:
+            await _single_delete(message, result)
+    except discord.HTTPException as e:
+        print(f"Bulk delete failed in #{channel}: {e}")
+        result.skipped += len(messages)
+
+
+async def _single_delete(message, result: PurgeResult):
+    try:
+        await message.delete()
+        result.deleted += 1
+    except discord.NotFound:
+        result.skipped += 1
+    except discord.HTTPException as e:
+        print(f"Failed to delete message {message.id}: {e}")
+        result.skipped += 1
@@ -0,0 +1,109 @@
+import asyncio
+import heapq
+import math
+import re
+import threading
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# Words too common in task and project text to help ranking
+STOPWORDS = frozenset("a an and are as at be by for from in is it of on or the this to with".split())
+# Matches in names count more than matches in descriptions
+FIELD_WEIGHTS = {"name": 3.0, "description": 1.0}
+
+
+def tokenize(text: str) -> list:
+    return [token for token in TOKEN_PATTERN.findall((text or "").casefold()) if token not in STOPWORDS]
+
+
+class SearchIndex:
+    """In-memory inverted index over task and project names and descriptions.
+
+    Built once at startup from the projects and every user's tasks, then kept
+    current by the commands that write them. Documents are keyed by
+    ("task", task_id) or ("project", project_id); results are ranked by TF-IDF
+    with name matches weighted above description matches.
+    """
+
+    def __init__(self):
+        self.documents = {}  # key -> summary shown in results
+        self.postings = {}  # token -> {key: weighted term frequency}
+        self._terms = {}  # key -> tokens it is posted under, for removal
+        self.ready = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def load(self, projects, tasks):
+        """Bulk load (project_id, data) and (user_id, task_id, data) entries."""
+        for project_id, project in projects:
+            self.add_project(project_id, project)
+        for user_id, task_id, task in tasks:
+            self.add_task(user_id, task_id, task)
+        self.ready = True
+
+    def add_project(self, project_id: str, data: dict):
+        summary = {"kind": "project", "id": project_id, "name": data.get("name"), "channel_id": data.get("channel_id")}
+        self._add(("project", project_id), summary, data.get("name"), data.get("description"))
+
+    def add_task(self, user_id: str, task_id: str, data: dict):
+        summary = {"kind": "task", "id": task_id, "name": data.get("task_name"), "user_id": str(user_id),
+                   "project_id": data.get("project_id"), "status": data.get("task_status")}
+        self._add(("task", task_id), summary, data.get("task_name"), data.get("task_description"))
+
+    def remove(self, kind: str, doc_id: str):
+        with self._lock:
+            self._remove((kind, doc_id))
+
+    def _add(self, key, summary: dict, name: str, description: str):
+        weights = {}
+        for field, text in (("name", name), ("description", description)):
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + FIELD_WEIGHTS[field]
+        with self._lock:
+            self._remove(key)
+            self.documents[key] = summary
+            self._terms[key] = tuple(weights)
+            for token, weight in weights.items():
+                self.postings.setdefault(token, {})[key] = weight
+
+    def _remove(self, key):
+        for token in self._terms.pop(key, ()):
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self.postings[token]
+        self.documents.pop(key, None)
+
+    def search(self, query: str, kind: str = None, limit: int = 10) -> list:
+        """Return up to `limit` (score, summary) pairs, best first."""
+        terms = set(tokenize(query))
+        scores = {}
+        with self._lock:
+            total = len(self.documents) or 1
+            for term in terms:
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + total / len(posting))
+                for key, weight in posting.items():
+                    if kind is None or key[0] == kind:
+                        scores[key] = scores.get(key, 0.0) + (1 + math.log(weight)) * idf
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(score, dict(self.documents[key])) for key, score in ranked]
+
+    def stats(self) -> dict:
+        return {"documents": len(self.documents), "terms": len(self.postings), "ready": self.ready}
+
+
+async def load_task_indexes(db, project_index, *indexes):
+    """Load the projects and every task, read with one collection-group query, into each in-memory index."""
+    snapshots = await db.get(db.collection_group("tasks"))
+    projects = list(project_index.projects.items())
+    # Tasks live at users/{user_id}/tasks/{task_id}
+    tasks = [(task.reference.parent.parent.id, task.id, task.to_dict()) for task in snapshots]
+    for index in indexes:
+        # Tokenizing thousands of documents is CPU work; keep it off the event loop
+        await asyncio.to_thread(index.load, projects, tasks)
+    print(f"Indexed {len(projects)} project(s) and {len(tasks)} task(s) for search and autocomplete")
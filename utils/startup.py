@@ -0,0 +1,28 @@
+import time
+from contextlib import contextmanager
+
+# Taken when this module is first imported, which bot.py does before anything heavy
+PROCESS_START = time.perf_counter()
+
+
+class StartupTimer:
+    """Records how long each startup phase took and prints a breakdown."""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def mark(self, name: str, started: float):
+        self.phases[name] = time.perf_counter() - started
+
+    def report(self, title: str = "Startup timing"):
+        print(f"{title} ({time.perf_counter() - PROCESS_START:.2f}s since launch):")
+        for name, elapsed in self.phases.items():
+            print(f"  {name:<16} {elapsed * 1000:8.1f} ms")